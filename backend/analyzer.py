@@ -1,96 +1,392 @@
-import re
+import os
+import json
 import math
+import time
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-def analyze_document(text: str) -> Dict:
-    """Comprehensive document analysis with professional metrics"""
+import database
+from cache import LRUCache, content_hash, normalize_text
+from scanner import TextScan, scan_text, scan_stream
+from lexicon import get_lexicon
+from word_features import count_syllables
+from batch_analyzer import scan_batch
+from sampling import BlockReservoir, SampledScan, sample_text, APPROXIMATE_SAMPLE_BLOCKS, APPROXIMATE_BLOCK_SIZE
+from text_reader import iter_text_chunks
+
+# Bump when the report format or any metric changes, so stale cached reports are ignored
+ANALYSIS_VERSION = "2"
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", 256))
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Seconds a process reuses the corpus size class in cache keys before reading it again
+CORPUS_EPOCH_TTL = float(os.environ.get("CORPUS_EPOCH_TTL", 30))
+
+_analysis_cache = LRUCache(ANALYSIS_CACHE_SIZE)
+_persistent_cache_stats = {"hits": 0, "misses": 0, "errors": 0}
+# (expiry, epoch) of the last corpus size read
+_corpus_epoch_cache = (0.0, 0)
+
+# Top-level report sections, in response order
+ANALYSIS_SECTIONS = (
+    "basic_statistics", "readability", "content_analysis",
+    "document_structure", "quality_metrics", "linguistic_features"
+)
+
+# Short names accepted in the fields parameter
+SECTION_ALIASES = {
+    "basic": "basic_statistics",
+    "statistics": "basic_statistics",
+    "content": "content_analysis",
+    "keywords": "content_analysis",
+    "sentiment": "content_analysis",
+    "structure": "document_structure",
+    "quality": "quality_metrics",
+    "linguistic": "linguistic_features",
+}
+
+def resolve_sections(fields: Optional[List[str]] = None) -> Tuple[str, ...]:
+    """Map requested field names to report sections, in canonical order"""
+    if not fields:
+        return ANALYSIS_SECTIONS
+    
+    requested = set()
+    unknown = []
+    for field in fields:
+        name = field.strip().lower()
+        section = name if name in ANALYSIS_SECTIONS else SECTION_ALIASES.get(name)
+        if section is None:
+            unknown.append(field)
+        else:
+            requested.add(section)
+    
+    if unknown:
+        raise ValueError(f"Unknown analysis field(s): {', '.join(unknown)}. Valid fields: {', '.join(ANALYSIS_SECTIONS)}")
+    
+    return tuple(section for section in ANALYSIS_SECTIONS if section in requested)
+
+def analyze_document(text: str, fields: Optional[List[str]] = None, use_cache: bool = True, approximate: bool = False) -> Dict:
+    """Comprehensive document analysis with professional metrics.
+    
+    With approximate=True, documents larger than the sampling budget are analyzed
+    from a fixed-size sample of blocks (see analyze_approximate), so latency does
+    not grow with document size. Smaller documents are analyzed exactly.
+    """
     if not text or not text.strip():
         return {"error": "No text provided for analysis"}
     
-    # Basic text processing
-    words = text.split()
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-    
-    # Character counts
-    chars_total = len(text)
-    chars_no_spaces = len(text.replace(' ', ''))
-    
-    # Advanced metrics
-    reading_time_minutes = len(words) / 225  # Average reading speed
-    flesch_score = calculate_flesch_score(text, words, sentences)
-    keywords = extract_keywords(text)
-    sentiment = analyze_sentiment(text)
-    complexity_metrics = calculate_complexity_metrics(text, words, sentences)
-    document_structure = analyze_document_structure(text, paragraphs)
-    content_quality = assess_content_quality(text, words, sentences)
+    sections = resolve_sections(fields)
+    if approximate:
+        if len(text) > APPROXIMATE_SAMPLE_BLOCKS * APPROXIMATE_BLOCK_SIZE:
+            return analyze_approximate(sample_text(text), sections)
+        return _with_exact_marker(analyze_document(text, fields, use_cache))
+    
+    text = normalize_text(text)
+    if not use_cache:
+        return compute_document_analysis(text, sections)
+    
+    key, cached = _lookup_report(text, sections)
+    if cached is not None:
+        return cached
+    
+    analysis = compute_document_analysis(text, sections)
+    _store_report(key, analysis)
+    return analysis
+
+def analyze_documents(texts: List[str], fields: Optional[List[str]] = None, use_cache: bool = True) -> List[Dict]:
+    """Analyze many documents at once; cache misses are scanned together in one vectorized batch"""
+    sections = resolve_sections(fields)
+    results = [None] * len(texts)
+    pending = []
+    
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            results[i] = {"error": "No text provided for analysis"}
+            continue
+        text = normalize_text(text)
+        key = None
+        if use_cache:
+            key, results[i] = _lookup_report(text, sections)
+        if results[i] is None:
+            pending.append((i, text, key))
+    
+    scans = scan_batch([text for _, text, _ in pending])
+    for (i, _, key), scan in zip(pending, scans):
+        results[i] = build_report(scan, sections)
+        if key is not None:
+            _store_report(key, results[i])
+    
+    return results
+
+def _lookup_report(text: str, sections: Tuple[str, ...]):
+    """Return the cache key for a report and the cached report, if any"""
+    # Keywords are ranked against the corpus, so reports are keyed by its size class too
+    version = f"{ANALYSIS_VERSION}.{_corpus_epoch()}"
+    full_key = content_hash(text, version)
+    if sections == ANALYSIS_SECTIONS:
+        key = full_key
+    else:
+        key = content_hash(text, version, *sections)
+    
+    cached = _cache_lookup(key)
+    if cached is not None:
+        return key, json.loads(cached)
+    
+    if key != full_key:
+        # A cached full report can serve any subset of it
+        cached = _cache_lookup(full_key)
+        if cached is not None:
+            report = json.loads(cached)
+            return key, {section: report[section] for section in sections}
+    
+    return key, None
+
+def _corpus_epoch() -> int:
+    """Changes each time the corpus doubles, which is when IDF weights shift noticeably.
+    
+    Read at most once per CORPUS_EPOCH_TTL seconds, so in-memory cache hits
+    stay free of database round trips.
+    """
+    global _corpus_epoch_cache
+    expires, epoch = _corpus_epoch_cache
+    now = time.monotonic()
+    if now < expires:
+        return epoch
+    try:
+        epoch = database.get_corpus_size().bit_length()
+    except Exception as e:
+        _database_error("Corpus size lookup", e)
+        return epoch
+    _corpus_epoch_cache = (now + CORPUS_EPOCH_TTL, epoch)
+    return epoch
+
+def _database_error(action: str, error: Exception):
+    _persistent_cache_stats["errors"] += 1
+    print(f"{action} failed: {str(error)}")
+
+def _store_report(key: str, report: Dict):
+    payload = json.dumps(report)
+    _analysis_cache.put(key, payload)
+    _store_persistent_analysis(key, payload)
+
+def _cache_lookup(key: str):
+    cached = _analysis_cache.get(key)
+    if cached is None:
+        cached = _load_persistent_analysis(key)
+        if cached is not None:
+            _analysis_cache.put(key, cached)
+    return cached
+
+def _load_persistent_analysis(key: str):
+    try:
+        cached = database.get_cached_analysis(key)
+    except Exception as e:
+        _database_error("Analysis cache lookup", e)
+        return None
+    
+    if cached is None:
+        _persistent_cache_stats["misses"] += 1
+    else:
+        _persistent_cache_stats["hits"] += 1
+    return cached
+
+def _store_persistent_analysis(key: str, payload: str):
+    try:
+        database.save_cached_analysis(key, payload)
+    except Exception as e:
+        _database_error("Analysis cache store", e)
+
+def get_analysis_cache_stats() -> Dict:
+    """Hit/miss counters for the in-process and SQLite analysis cache tiers"""
+    persistent = dict(_persistent_cache_stats)
+    try:
+        persistent.update(database.get_analysis_cache_stats())
+    except Exception as e:
+        persistent["error"] = str(e)
+    
+    return {"memory": _analysis_cache.stats(), "persistent": persistent}
+
+def compute_document_analysis(text: str, sections: Tuple[str, ...] = ANALYSIS_SECTIONS) -> Dict:
+    """Compute the requested report sections, bypassing the cache"""
+    # Tokens, sentences, paragraphs and counters are scanned lazily, on first use
+    return build_report(scan_text(text), sections)
+
+def build_report(scan: TextScan, sections: Tuple[str, ...] = ANALYSIS_SECTIONS) -> Dict:
+    return {section: SECTION_BUILDERS[section](scan) for section in sections}
+
+def analyze_stream(chunks: Iterable[str], fields: Optional[List[str]] = None, approximate: bool = False) -> Dict:
+    """Analyze text arriving in chunks without holding the whole document in memory"""
+    sections = resolve_sections(fields)
+    if approximate:
+        # Every chunk is still read, but only a reservoir sample of blocks is scanned
+        reservoir = BlockReservoir(seed=0)
+        for chunk in _normalized_chunks(chunks):
+            reservoir.feed(chunk)
+        blocks = reservoir.finish()
+        if reservoir.block_count > len(blocks):
+            sample = SampledScan(blocks, reservoir.total_chars, reservoir.block_count)
+            return analyze_approximate(sample, sections)
+        # The whole stream fit in the reservoir, in order
+        scan = scan_text("".join(blocks))
+        if not scan.word_count:
+            return {"error": "No text provided for analysis"}
+        return _with_exact_marker(build_report(scan, sections))
+    
+    scan = scan_stream(_normalized_chunks(chunks))
+    
+    if not scan.word_count:
+        return {"error": "No text provided for analysis"}
+    
+    return build_report(scan, sections)
+
+def analyze_text_file(file_path: str, fields: Optional[List[str]] = None, chunk_size: int = STREAM_CHUNK_SIZE, encoding: Optional[str] = None, approximate: bool = False) -> Dict:
+    """Stream a text file from disk through the analyzer, detecting its encoding unless given"""
+    return analyze_stream(iter_text_chunks(file_path, chunk_size, encoding), fields, approximate)
+
+# Report fields that are known exactly even from a sample
+APPROXIMATE_EXACT_FIELDS = {("basic_statistics", "character_count")}
+
+APPROXIMATE_CONFIDENCE_Z = 1.96
+
+def analyze_approximate(sample: SampledScan, sections: Tuple[str, ...] = ANALYSIS_SECTIONS) -> Dict:
+    """Estimate a report from a block sample, with 95% jackknife confidence intervals.
+    
+    The report is built by the usual section builders from counters scaled up from
+    the sample. Each interval comes from recomputing the metric with one block left
+    out at a time, with a finite-population correction for the sampled fraction.
+    """
+    report = build_report(sample.scan(), sections)
+    
+    metrics = {path: metric for path, metric in APPROXIMATE_INTERVAL_METRICS.items() if path[0] in sections}
+    intervals = {}
+    k = len(sample.blocks)
+    if k > 1:
+        replicates = {path: [] for path in metrics}
+        for i in range(k):
+            scan = sample.scan(exclude=i, keywords=False)
+            for path, (metric, _) in metrics.items():
+                replicates[path].append(metric(scan))
+        
+        correction = max(0.0, 1 - k / sample.population_blocks)
+        for path, values in replicates.items():
+            estimate = _report_value(report, path)
+            if not isinstance(estimate, (int, float)):
+                continue
+            mean = sum(values) / k
+            error = math.sqrt((k - 1) / k * sum((v - mean) ** 2 for v in values) * correction)
+            margin = APPROXIMATE_CONFIDENCE_Z * error + metrics[path][1] / 2
+            intervals[".".join(path)] = [round(max(0, estimate - margin), 2), round(estimate + margin, 2)]
+    
+    report["approximation"] = {
+        "estimated_fields": [".".join(path) for path in _report_fields(report) if path not in APPROXIMATE_EXACT_FIELDS],
+        "confidence_intervals": intervals,
+        "confidence_level": 0.95,
+        "sample_fraction": round(sample.sample_fraction, 4),
+        "sampled_blocks": k,
+        "total_blocks": sample.population_blocks
+    }
+    return report
+
+def _with_exact_marker(report: Dict) -> Dict:
+    if "error" in report:
+        return report
+    report = dict(report)
+    report["approximation"] = {"estimated_fields": [], "confidence_intervals": {}, "confidence_level": 0.95, "sample_fraction": 1.0}
+    return report
+
+def _report_value(report: Dict, path: Tuple[str, ...]):
+    value = report
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+def _report_fields(report: Dict, prefix: Tuple[str, ...] = ()) -> Iterator[Tuple[str, ...]]:
+    """Paths of all leaf fields of a (nested) report"""
+    for key, value in report.items():
+        if isinstance(value, dict):
+            yield from _report_fields(value, prefix + (key,))
+        else:
+            yield prefix + (key,)
+
+def _normalized_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    # Hold back a trailing carriage return so a CRLF split across chunks becomes one newline
+    pending = ""
+    for chunk in chunks:
+        chunk = pending + chunk
+        pending = ""
+        if chunk.endswith('\r'):
+            chunk, pending = chunk[:-1], '\r'
+        yield normalize_text(chunk)
+    if pending:
+        yield normalize_text(pending)
+
+def build_basic_statistics(scan: TextScan) -> Dict:
+    return {
+        "word_count": scan.word_count,
+        "sentence_count": scan.sentence_count,
+        "paragraph_count": scan.paragraph_count,
+        "character_count": scan.char_count,
+        "character_count_no_spaces": scan.char_count - scan.space_count,
+        "average_word_length": round(scan.word_length_total / scan.word_count, 2) if scan.word_count else 0,
+        "average_sentence_length": round(scan.word_count / scan.sentence_count, 1) if scan.sentence_count else 0,
+        "average_paragraph_length": round(scan.sentence_count / scan.paragraph_count, 1) if scan.paragraph_count else 0
+    }
+
+def build_readability(scan: TextScan) -> Dict:
+    reading_time_minutes = scan.word_count / 225  # Average reading speed
+    flesch_score = scan_flesch_score(scan)
+    complexity_metrics = calculate_complexity_metrics(scan)
+    
+    return {
+        "flesch_reading_ease": flesch_score,
+        "readability_level": get_readability_level(flesch_score),
+        "grade_level": calculate_grade_level(flesch_score),
+        "reading_time_minutes": round(reading_time_minutes, 1),
+        "reading_time_seconds": round(reading_time_minutes * 60),
+        "complexity_score": complexity_metrics["complexity_score"]
+    }
+
+def build_content_analysis(scan: TextScan) -> Dict:
+    # One read of the corpus statistics per report
+    corpus_size, document_frequency = _corpus_frequencies(keyword_candidates(scan))
+    keywords = extract_keywords(scan, corpus_size=corpus_size, document_frequency=document_frequency)
     
     return {
-        "basic_statistics": {
-            "word_count": len(words),
-            "sentence_count": len(sentences),
-            "paragraph_count": len(paragraphs),
-            "character_count": chars_total,
-            "character_count_no_spaces": chars_no_spaces,
-            "average_word_length": round(sum(len(word) for word in words) / len(words), 2) if words else 0,
-            "average_sentence_length": round(len(words) / len(sentences), 1) if sentences else 0,
-            "average_paragraph_length": round(len(sentences) / len(paragraphs), 1) if paragraphs else 0
-        },
-        "readability": {
-            "flesch_reading_ease": flesch_score,
-            "readability_level": get_readability_level(flesch_score),
-            "grade_level": calculate_grade_level(flesch_score),
-            "reading_time_minutes": round(reading_time_minutes, 1),
-            "reading_time_seconds": round(reading_time_minutes * 60),
-            "complexity_score": complexity_metrics["complexity_score"]
-        },
-        "content_analysis": {
-            "keywords": keywords,
-            "sentiment": sentiment,
-            "topic_diversity": calculate_topic_diversity(keywords),
-            "information_density": calculate_information_density(text, words),
-            "vocabulary_richness": calculate_vocabulary_richness(words)
-        },
-        "document_structure": document_structure,
-        "quality_metrics": content_quality,
-        "linguistic_features": {
-            "punctuation_density": calculate_punctuation_density(text),
-            "capitalization_ratio": calculate_capitalization_ratio(text),
-            "numeric_content_ratio": calculate_numeric_ratio(text),
-            "question_ratio": calculate_question_ratio(sentences)
-        }
+        "keywords": keywords,
+        "sentiment": analyze_sentiment(scan),
+        "topic_diversity": calculate_topic_diversity(keywords),
+        "information_density": calculate_information_density(scan),
+        "vocabulary_richness": calculate_vocabulary_richness(scan)
+    }
+
+def build_linguistic_features(scan: TextScan) -> Dict:
+    return {
+        "punctuation_density": calculate_punctuation_density(scan),
+        "capitalization_ratio": calculate_capitalization_ratio(scan),
+        "numeric_content_ratio": calculate_numeric_ratio(scan),
+        "question_ratio": calculate_question_ratio(scan)
     }
 
 def calculate_flesch_score(text: str, words: list, sentences: list) -> float:
+    """Flesch reading ease of already split words and sentences"""
     if not words or not sentences:
         return 0
     
     syllable_count = sum(count_syllables(word) for word in words)
-    
-    if len(sentences) == 0 or len(words) == 0:
+    return _flesch_score(len(words), len(sentences), syllable_count)
+
+def scan_flesch_score(scan: TextScan) -> float:
+    """Flesch reading ease from the counts of one scan"""
+    if not scan.word_count or not scan.sentence_count:
         return 0
     
-    score = 206.835 - (1.015 * (len(words) / len(sentences))) - (84.6 * (syllable_count / len(words)))
-    return round(max(0, min(100, score)), 1)
+    return _flesch_score(scan.word_count, scan.sentence_count, scan.syllable_count)
 
-def count_syllables(word: str) -> int:
-    word = word.lower()
-    vowels = 'aeiouy'
-    count = 0
-    prev_char_was_vowel = False
-    
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not prev_char_was_vowel:
-            count += 1
-        prev_char_was_vowel = is_vowel
-    
-    if word.endswith('e'):
-        count -= 1
-    
-    return max(1, count)
+def _flesch_score(word_count: int, sentence_count: int, syllable_count: int) -> float:
+    score = 206.835 - (1.015 * (word_count / sentence_count)) - (84.6 * (syllable_count / word_count))
+    return round(max(0, min(100, score)), 1)
 
 def get_readability_level(score: float) -> str:
     """Get readability level description"""
@@ -126,21 +422,18 @@ def calculate_grade_level(flesch_score: float) -> str:
     else:
         return "Graduate Level"
 
-def calculate_complexity_metrics(text: str, words: List[str], sentences: List[str]) -> Dict:
+def calculate_complexity_metrics(scan: TextScan) -> Dict:
     """Calculate advanced complexity metrics"""
-    if not words or not sentences:
+    if not scan.word_count or not scan.sentence_count:
         return {"complexity_score": 0, "sentence_variety": 0}
     
-    # Sentence length variance
-    sentence_lengths = [len(s.split()) for s in sentences if s.strip()]
-    if sentence_lengths:
-        variance = sum((x - sum(sentence_lengths)/len(sentence_lengths))**2 for x in sentence_lengths) / len(sentence_lengths)
-        sentence_variety = min(100, variance / 10)
-    else:
-        sentence_variety = 0
+    # Sentence length variance, from the running sum and sum of squares
+    n = scan.sentence_count
+    variance = (n * scan.sentence_length_squares - scan.sentence_length_total ** 2) / (n * n)
+    sentence_variety = min(100, variance / 10)
     
     # Word complexity (longer words = more complex)
-    avg_word_length = sum(len(word) for word in words) / len(words)
+    avg_word_length = scan.word_length_total / scan.word_count
     word_complexity = min(100, (avg_word_length - 3) * 20)
     
     # Overall complexity score
@@ -152,23 +445,19 @@ def calculate_complexity_metrics(text: str, words: List[str], sentences: List[st
         "word_complexity": round(word_complexity, 1)
     }
 
-def analyze_document_structure(text: str, paragraphs: List[str]) -> Dict:
+def analyze_document_structure(scan: TextScan) -> Dict:
     """Analyze document structure and organization"""
-    if not paragraphs:
+    if not scan.paragraph_count:
         return {"structure_score": 0, "organization": "Poor"}
     
     # Paragraph length consistency
-    para_lengths = [len(p.split()) for p in paragraphs]
-    if para_lengths:
-        avg_para_length = sum(para_lengths) / len(para_lengths)
-        para_consistency = 100 - min(100, abs(max(para_lengths) - min(para_lengths)) / max(1, avg_para_length) * 50)
-    else:
-        para_consistency = 0
+    avg_para_length = scan.paragraph_length_total / scan.paragraph_count
+    para_consistency = 100 - min(100, abs(scan.paragraph_length_max - scan.paragraph_length_min) / max(1, avg_para_length) * 50)
     
     # Headers and structure indicators
-    headers = len(re.findall(r'\n[A-Z][A-Z\s]*:\s*', text))
-    bullet_points = len(re.findall(r'[•\-\*]\s+', text))
-    numbered_lists = len(re.findall(r'\d+\.\s+', text))
+    headers = scan.header_count
+    bullet_points = scan.bullet_count
+    numbered_lists = scan.numbered_list_count
     
     structure_score = min(100, para_consistency + (headers * 5) + (bullet_points * 2) + (numbered_lists * 3))
     
@@ -190,23 +479,19 @@ def analyze_document_structure(text: str, paragraphs: List[str]) -> Dict:
         "numbered_lists_count": numbered_lists
     }
 
-def assess_content_quality(text: str, words: List[str], sentences: List[str]) -> Dict:
+def assess_content_quality(scan: TextScan) -> Dict:
     """Assess overall content quality"""
-    if not words or not sentences:
+    if not scan.word_count or not scan.sentence_count:
         return {"quality_score": 0, "quality_level": "Poor"}
     
     # Vocabulary sophistication
-    sophisticated_words = sum(1 for word in words if len(word) > 6)
-    vocab_sophistication = min(100, (sophisticated_words / len(words)) * 300)
+    vocab_sophistication = min(100, (scan.long_word_count / scan.word_count) * 300)
     
     # Information density (unique words / total words)
-    unique_words = len(set(word.lower() for word in words))
-    info_density = min(100, (unique_words / len(words)) * 100)
+    info_density = min(100, (scan.unique_word_count / scan.word_count) * 100)
     
     # Sentence structure variety
-    short_sentences = sum(1 for s in sentences if len(s.split()) < 10)
-    long_sentences = sum(1 for s in sentences if len(s.split()) > 20)
-    structure_variety = min(100, (abs(short_sentences - long_sentences) / len(sentences)) * 100)
+    structure_variety = min(100, (abs(scan.short_sentence_count - scan.long_sentence_count) / scan.sentence_count) * 100)
     
     # Overall quality score
     quality_score = round((vocab_sophistication + info_density + structure_variety) / 3, 1)
@@ -236,91 +521,89 @@ def calculate_topic_diversity(keywords: List[str]) -> float:
     # Simple diversity metric based on keyword variety
     return min(100, len(keywords) * 10)
 
-def calculate_information_density(text: str, words: List[str]) -> float:
+def calculate_information_density(scan: TextScan) -> float:
     """Calculate information density (unique content ratio)"""
-    if not words:
+    if not scan.word_count:
         return 0.0
     
-    unique_words = len(set(word.lower() for word in words if word.isalpha()))
-    return round((unique_words / len(words)) * 100, 2) if words else 0
+    return round((scan.unique_alpha_word_count / scan.word_count) * 100, 2)
 
-def calculate_vocabulary_richness(words: List[str]) -> float:
+def calculate_vocabulary_richness(scan: TextScan) -> float:
     """Calculate vocabulary richness (Type-Token Ratio)"""
-    if not words:
+    if not scan.word_count:
         return 0.0
     
-    unique_words = len(set(word.lower() for word in words if word.isalpha()))
-    total_words = len([word for word in words if word.isalpha()])
+    unique_words = scan.unique_alpha_word_count
+    total_words = scan.alpha_word_count
     
     return round((unique_words / total_words) * 100, 2) if total_words > 0 else 0
 
-def calculate_punctuation_density(text: str) -> float:
+def calculate_punctuation_density(scan: TextScan) -> float:
     """Calculate punctuation density"""
-    punctuation_chars = sum(1 for char in text if char in '.,;:!?')
-    return round((punctuation_chars / len(text)) * 100, 2) if text else 0
+    return round((scan.punctuation_count / scan.char_count) * 100, 2) if scan.char_count else 0
 
-def calculate_capitalization_ratio(text: str) -> float:
+def calculate_capitalization_ratio(scan: TextScan) -> float:
     """Calculate ratio of capital letters"""
-    if not text:
+    if not scan.char_count:
         return 0.0
     
-    capitals = sum(1 for char in text if char.isupper())
-    letters = sum(1 for char in text if char.isalpha())
-    
-    return round((capitals / letters) * 100, 2) if letters > 0 else 0
+    return round((scan.upper_count / scan.alpha_count) * 100, 2) if scan.alpha_count > 0 else 0
 
-def calculate_numeric_ratio(text: str) -> float:
+def calculate_numeric_ratio(scan: TextScan) -> float:
     """Calculate ratio of numeric content"""
-    if not text:
+    if not scan.char_count:
         return 0.0
     
-    numbers = sum(1 for char in text if char.isdigit())
-    return round((numbers / len(text)) * 100, 2)
+    return round((scan.digit_count / scan.char_count) * 100, 2)
 
-def calculate_question_ratio(sentences: List[str]) -> float:
+def calculate_question_ratio(scan: TextScan) -> float:
     """Calculate ratio of questions in the text"""
-    if not sentences:
+    if not scan.sentence_count:
         return 0.0
     
-    questions = sum(1 for sentence in sentences if sentence.strip().endswith('?'))
-    return round((questions / len(sentences)) * 100, 2)
+    return round((scan.question_count / scan.sentence_count) * 100, 2)
 
-def extract_keywords(text: str, top_n: int = 10) -> list:
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    
-    stop_words = {
-        'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one',
-        'had', 'use', 'his', 'has', 'who', 'oil', 'its', 'now', 'how', 'did', 'get', 'may',
-        'him', 'old', 'see', 'two', 'way', 'she', 'day', 'man', 'boy', 'new', 'let', 'put'
-    }
-    
-    filtered_words = [word for word in words if word not in stop_words and len(word) > 3]
-    word_freq = Counter(filtered_words)
+def keyword_candidates(scan: TextScan) -> Counter:
+    """In-document frequencies of the words that can be keywords"""
+    stop_words = get_lexicon().keyword_stop_words
+    return Counter({word: n for word, n in scan.keyword_counts.items() if word not in stop_words and len(word) > 3})
+
+def _corpus_frequencies(terms: Iterable[str]) -> Tuple[int, Dict[str, int]]:
+    """Saved-document count and the document frequency of each term, or (0, {}) if unavailable"""
+    try:
+        return database.get_document_frequencies(terms)
+    except Exception as e:
+        _database_error("Document frequency lookup", e)
+        return 0, {}
+
+def extract_keywords(text: Union[str, TextScan], top_n: int = 10, corpus_size: int = 0,
+                     document_frequency: Optional[Dict[str, int]] = None) -> list:
+    """The top_n keywords by in-document frequency, weighted by inverse document
+    frequency when corpus statistics (see database.get_document_frequencies) are given"""
+    scan = text if isinstance(text, TextScan) else scan_text(text)
+    word_freq = keyword_candidates(scan)
+    document_frequency = document_frequency or {}
+    
+    if corpus_size:
+        word_freq = Counter({
+            word: n * (math.log((1 + corpus_size) / (1 + document_frequency.get(word, 0))) + 1)
+            for word, n in word_freq.items()
+        })
     
     return [word for word, _ in word_freq.most_common(top_n)]
 
-def analyze_sentiment(text: str) -> Dict:
-    positive_words = [
-        'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive',
-        'success', 'achieve', 'benefit', 'improve', 'effective', 'efficient'
-    ]
-    
-    negative_words = [
-        'bad', 'terrible', 'awful', 'horrible', 'negative', 'fail', 'problem',
-        'issue', 'difficult', 'challenge', 'concern', 'risk', 'threat'
-    ]
+def analyze_sentiment(text: Union[str, TextScan]) -> Dict:
+    scan = text if isinstance(text, TextScan) else scan_text(text)
     
-    words = text.lower().split()
-    
-    positive_count = sum(1 for word in words if word in positive_words)
-    negative_count = sum(1 for word in words if word in negative_words)
+    positive_count = scan.positive_word_count
+    negative_count = scan.negative_word_count
     
     total_sentiment_words = positive_count + negative_count
     
     if total_sentiment_words == 0:
         return {"polarity": "neutral", "confidence": 0.5}
     
-    polarity_score = (positive_count - negative_count) / len(words)
+    polarity_score = (positive_count - negative_count) / scan.word_count
     
     if polarity_score > 0.01:
         polarity = "positive"
@@ -336,4 +619,28 @@ def analyze_sentiment(text: str) -> Dict:
         "confidence": round(confidence, 2),
         "positive_words": positive_count,
         "negative_words": negative_count
-    }
\ No newline at end of file
+    }
+
+SECTION_BUILDERS = {
+    "basic_statistics": build_basic_statistics,
+    "readability": build_readability,
+    "content_analysis": build_content_analysis,
+    "document_structure": analyze_document_structure,
+    "quality_metrics": assess_content_quality,
+    "linguistic_features": build_linguistic_features,
+}
+
+# Metrics reported with a confidence interval in approximate mode, with the
+# resolution they are rounded to (half of it is added to the margin)
+APPROXIMATE_INTERVAL_METRICS = {
+    ("basic_statistics", "word_count"): (lambda scan: scan.word_count, 1),
+    ("basic_statistics", "sentence_count"): (lambda scan: scan.sentence_count, 1),
+    ("basic_statistics", "average_sentence_length"): (lambda scan: build_basic_statistics(scan)["average_sentence_length"], 0.1),
+    ("readability", "flesch_reading_ease"): (scan_flesch_score, 0.1),
+    ("readability", "complexity_score"): (lambda scan: calculate_complexity_metrics(scan)["complexity_score"], 0.1),
+    ("content_analysis", "vocabulary_richness"): (calculate_vocabulary_richness, 0.01),
+    ("content_analysis", "information_density"): (calculate_information_density, 0.01),
+    ("content_analysis", "sentiment", "positive_words"): (lambda scan: scan.positive_word_count, 1),
+    ("content_analysis", "sentiment", "negative_words"): (lambda scan: scan.negative_word_count, 1),
+    ("quality_metrics", "quality_score"): (lambda scan: assess_content_quality(scan)["quality_score"], 0.1),
+}
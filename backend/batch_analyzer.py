@@ -0,0 +1,229 @@
+from collections import Counter
+from typing import Dict, List
+
+from scanner import (
+    TextScan, scan_text,
+    SENTENCE_SPLIT_PATTERN, KEYWORD_TOKEN_PATTERN, HEADER_PATTERN, BULLET_PATTERN,
+    NUMBERED_LIST_PATTERN, PUNCTUATION_CHARS
+)
+from lexicon import count_phrases, get_lexicon
+from word_features import get_word_features
+from lazy_imports import load_module, module_available
+
+# NumPy is imported by the first batch of documents, not at startup
+NUMPY_AVAILABLE = module_available("numpy")
+
+def scan_batch(texts: List[str]) -> List[TextScan]:
+    """Scan many documents at once, computing their counters over shared NumPy arrays.
+
+    Each document is tokenized into Counters (C-level), the distinct tokens of all
+    documents are interned into one shared vocabulary, and per-document statistics
+    are reduced with bincount over (document, token) arrays. Falls back to one
+    TextScan per document when NumPy is not installed.
+    """
+    if not NUMPY_AVAILABLE or len(texts) < 2:
+        return [scan_text(text) for text in texts]
+
+    fields = [{"text": text, "char_count": len(text)} for text in texts]
+
+    _scan_character_classes(texts, fields)
+    _scan_words(texts, fields)
+    _scan_runs(texts, fields)
+
+    for text, doc in zip(texts, fields):
+        doc["header_count"] = len(HEADER_PATTERN.findall(text))
+        doc["bullet_count"] = len(BULLET_PATTERN.findall(text))
+        doc["numbered_list_count"] = len(NUMBERED_LIST_PATTERN.findall(text))
+
+    return [TextScan.from_counts(**doc) for doc in fields]
+
+def _index_pairs(counters: List[Counter], vocab: Dict):
+    """Flatten per-document Counters into (document, vocabulary id, count) arrays"""
+    np = load_module("numpy")
+    sizes = [len(counter) for counter in counters]
+    ids = [vocab.setdefault(key, len(vocab)) for counter in counters for key in counter]
+    counts = [n for counter in counters for n in counter.values()]
+
+    doc_index = np.repeat(np.arange(len(counters)), sizes)
+    return doc_index, np.array(ids, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+def _doc_sums(doc_index, values, n_docs: int) -> List[int]:
+    np = load_module("numpy")
+    return np.bincount(doc_index, weights=values, minlength=n_docs).astype(np.int64).tolist()
+
+def _doc_unique(doc_index, ids, n_ids: int, n_docs: int) -> List[int]:
+    """Number of distinct ids per document"""
+    np = load_module("numpy")
+    keys = np.unique(doc_index * max(1, n_ids) + ids)
+    return np.bincount(keys // max(1, n_ids), minlength=n_docs).tolist()
+
+def _scan_character_classes(texts: List[str], fields: List[Dict]):
+    np = load_module("numpy")
+    n_docs = len(texts)
+    vocab = {}
+    doc_index, ids, counts = _index_pairs([Counter(text) for text in texts], vocab)
+
+    chars = list(vocab)
+    is_upper = np.fromiter(map(str.isupper, chars), dtype=bool, count=len(chars))
+    is_alpha = np.fromiter(map(str.isalpha, chars), dtype=bool, count=len(chars))
+    is_digit = np.fromiter(map(str.isdigit, chars), dtype=bool, count=len(chars))
+    is_punct = np.fromiter((c in PUNCTUATION_CHARS for c in chars), dtype=bool, count=len(chars))
+    is_space = np.fromiter((c == ' ' for c in chars), dtype=bool, count=len(chars))
+
+    columns = {
+        "space_count": _doc_sums(doc_index, counts * is_space[ids], n_docs),
+        "punctuation_count": _doc_sums(doc_index, counts * is_punct[ids], n_docs),
+        "upper_count": _doc_sums(doc_index, counts * is_upper[ids], n_docs),
+        "alpha_count": _doc_sums(doc_index, counts * is_alpha[ids], n_docs),
+        "digit_count": _doc_sums(doc_index, counts * is_digit[ids], n_docs),
+    }
+    for name, values in columns.items():
+        for doc, value in zip(fields, values):
+            doc[name] = value
+
+def _scan_words(texts: List[str], fields: List[Dict]):
+    np = load_module("numpy")
+    n_docs = len(texts)
+    vocab = {}
+    # Counter keeps first-occurrence order, which keyword ranking relies on for ties
+    doc_index, ids, counts = _index_pairs([Counter(text.split()) for text in texts], vocab)
+
+    # Features are computed once per distinct token across the whole batch
+    features = list(map(get_word_features, vocab))
+    lengths = np.fromiter((f.length for f in features), dtype=np.int64, count=len(features))
+    syllables = np.fromiter((f.syllables for f in features), dtype=np.int64, count=len(features))
+    is_alpha = np.fromiter((f.is_alpha for f in features), dtype=bool, count=len(features))
+    lower_vocab = {}
+    lower_ids = np.fromiter(
+        (lower_vocab.setdefault(f.lower, len(lower_vocab)) for f in features),
+        dtype=np.int64, count=len(features)
+    )
+    lowers = list(lower_vocab)
+    lexicon = get_lexicon()
+    polarity = np.fromiter((lexicon.polarity.get(word, 0) for word in lowers), dtype=np.int64, count=len(lowers))
+    is_positive = polarity > 0
+    is_negative = polarity < 0
+
+    pair_lengths = lengths[ids]
+    pair_lower = lower_ids[ids]
+    pair_alpha = is_alpha[ids]
+
+    columns = {
+        "word_count": _doc_sums(doc_index, counts, n_docs),
+        "word_length_total": _doc_sums(doc_index, counts * pair_lengths, n_docs),
+        "long_word_count": _doc_sums(doc_index, counts * (pair_lengths > 6), n_docs),
+        "alpha_word_count": _doc_sums(doc_index, counts * pair_alpha, n_docs),
+        "syllable_count": _doc_sums(doc_index, counts * syllables[ids], n_docs),
+        "positive_word_count": _doc_sums(doc_index, counts * is_positive[pair_lower], n_docs),
+        "negative_word_count": _doc_sums(doc_index, counts * is_negative[pair_lower], n_docs),
+        "unique_word_count": _doc_unique(doc_index, pair_lower, len(lowers), n_docs),
+        "unique_alpha_word_count": _doc_unique(doc_index[pair_alpha], pair_lower[pair_alpha], len(lowers), n_docs),
+    }
+    for name, values in columns.items():
+        for doc, value in zip(fields, values):
+            doc[name] = value
+
+    if lexicon.has_phrases:
+        # Phrase matching needs token order, so only documents with a phrase's first word are walked
+        has_first = np.fromiter((word in lexicon.phrases for word in lowers), dtype=bool, count=len(lowers))
+        candidates = np.unique(doc_index[has_first[pair_lower]]).tolist()
+        for d in candidates:
+            positive, negative = count_phrases(lexicon, texts[d].lower().split())
+            fields[d]["positive_word_count"] += positive
+            fields[d]["negative_word_count"] += negative
+
+    keyword_counts = _keyword_counts(doc_index, counts, pair_lower, lowers, n_docs)
+    for doc, counter in zip(fields, keyword_counts):
+        doc["keyword_counts"] = counter
+
+def _keyword_counts(doc_index, counts, pair_lower, lowers: List[str], n_docs: int) -> List[Counter]:
+    """Per-document keyword Counters, in first-occurrence order like TextScan's"""
+    np = load_module("numpy")
+    keyword_vocab = {}
+    per_lower = [
+        [keyword_vocab.setdefault(token, len(keyword_vocab)) for token in KEYWORD_TOKEN_PATTERN.findall(word)]
+        for word in lowers
+    ]
+    if not keyword_vocab:
+        return [Counter() for _ in range(n_docs)]
+
+    lower_sizes = np.fromiter(map(len, per_lower), dtype=np.int64, count=len(per_lower))
+    lower_offsets = np.concatenate(([0], np.cumsum(lower_sizes)[:-1]))
+    flat_keywords = np.array([k for ids in per_lower for k in ids], dtype=np.int64)
+
+    # Expand every (document, token) pair into its keyword occurrences
+    pair_sizes = lower_sizes[pair_lower]
+    pair_index = np.repeat(np.arange(len(pair_lower)), pair_sizes)
+    starts = np.repeat(np.cumsum(pair_sizes) - pair_sizes, pair_sizes)
+    position = np.arange(len(pair_index)) - starts
+    keyword = flat_keywords[lower_offsets[pair_lower[pair_index]] + position]
+    # Pairs are in first-occurrence order within each document, so this orders occurrences
+    rank = pair_index * (int(lower_sizes.max()) + 1) + position
+
+    n_keywords = len(keyword_vocab)
+    keys, inverse = np.unique(doc_index[pair_index] * n_keywords + keyword, return_inverse=True)
+    totals = np.bincount(inverse, weights=counts[pair_index]).astype(np.int64)
+    first = np.full(len(keys), np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, inverse, rank)
+
+    key_docs = keys // n_keywords
+    order = np.lexsort((first, key_docs))
+    names = np.array(list(keyword_vocab), dtype=object)[(keys % n_keywords)[order]].tolist()
+    totals = totals[order].tolist()
+    bounds = np.searchsorted(key_docs[order], np.arange(n_docs + 1)).tolist()
+
+    return [
+        Counter(dict(zip(names[bounds[d]:bounds[d + 1]], totals[bounds[d]:bounds[d + 1]])))
+        for d in range(n_docs)
+    ]
+
+def _scan_runs(texts: List[str], fields: List[Dict]):
+    np = load_module("numpy")
+    n_docs = len(texts)
+
+    sentence_lengths = []
+    sentence_sizes = []
+    paragraph_lengths = []
+    paragraph_sizes = []
+    for text, doc in zip(texts, fields):
+        pieces = SENTENCE_SPLIT_PATTERN.split(text)
+        sentence_lengths.extend(len(piece.split()) for piece in pieces)
+        sentence_sizes.append(len(pieces))
+        doc["question_count"] = sum(1 for piece in pieces if piece.strip().endswith('?'))
+
+        pieces = text.split('\n\n')
+        paragraph_lengths.extend(len(piece.split()) for piece in pieces)
+        paragraph_sizes.append(len(pieces))
+
+    # Whitespace-only pieces have no words and are not sentences or paragraphs
+    lengths = np.array(sentence_lengths, dtype=np.int64)
+    doc_index = np.repeat(np.arange(n_docs), sentence_sizes)
+    mask = lengths > 0
+    lengths, doc_index = lengths[mask], doc_index[mask]
+    columns = {
+        "sentence_count": np.bincount(doc_index, minlength=n_docs).tolist(),
+        "sentence_length_total": _doc_sums(doc_index, lengths, n_docs),
+        "sentence_length_squares": _doc_sums(doc_index, lengths * lengths, n_docs),
+        "short_sentence_count": _doc_sums(doc_index, lengths < 10, n_docs),
+        "long_sentence_count": _doc_sums(doc_index, lengths > 20, n_docs),
+    }
+
+    lengths = np.array(paragraph_lengths, dtype=np.int64)
+    doc_index = np.repeat(np.arange(n_docs), paragraph_sizes)
+    mask = lengths > 0
+    lengths, doc_index = lengths[mask], doc_index[mask]
+    paragraph_count = np.bincount(doc_index, minlength=n_docs)
+    minimum = np.full(n_docs, np.iinfo(np.int64).max, dtype=np.int64)
+    maximum = np.zeros(n_docs, dtype=np.int64)
+    np.minimum.at(minimum, doc_index, lengths)
+    np.maximum.at(maximum, doc_index, lengths)
+    columns.update({
+        "paragraph_count": paragraph_count.tolist(),
+        "paragraph_length_total": _doc_sums(doc_index, lengths, n_docs),
+        "paragraph_length_min": np.where(paragraph_count > 0, minimum, 0).tolist(),
+        "paragraph_length_max": maximum.tolist(),
+    })
+
+    for name, values in columns.items():
+        for doc, value in zip(fields, values):
+            doc[name] = value
@@ -1,13 +1,130 @@
+import atexit
+import os
 import sqlite3
 import json
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 
+from scanner import scan_text
+
 DATABASE_PATH = Path(__file__).parent / "documents.db"
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_DB_SIZE", 5000))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.environ.get("EXTRACTION_CACHE_DB_SIZE", 1000))
+# Stored in PRAGMA user_version once init_database has brought the file up to date;
+# bump when init_database creates or migrates anything new
+SCHEMA_VERSION = 1
+# Seconds a writer waits for another writer's lock before failing
+DATABASE_BUSY_TIMEOUT = float(os.environ.get("DATABASE_BUSY_TIMEOUT", 10))
+# Page cache and memory map per connection, and compiled statements kept for reuse
+DATABASE_CACHE_KB = int(os.environ.get("DATABASE_CACHE_KB", 16384))
+DATABASE_MMAP_BYTES = int(os.environ.get("DATABASE_MMAP_BYTES", 256 << 20))
+DATABASE_STATEMENT_CACHE = int(os.environ.get("DATABASE_STATEMENT_CACHE", 256))
+
+_initialized = False
+_init_lock = threading.Lock()
+_local = threading.local()
+_pool = weakref.WeakSet()
+_pool_lock = threading.Lock()
+# Layout of the documents table, detected once by init_database
+_schema = {}
+
+class _PooledConnection:
+    """One thread's connection; it is closed when the thread ends and this holder is collected"""
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.closed = False
+
+def init_database(force: bool = False):
+    """Create or migrate the schema, once per process.
+    
+    A file already stamped with SCHEMA_VERSION costs a single PRAGMA read, so
+    cold starts skip the table and column checks. The documents table layout
+    is detected here and cached for every later query.
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized and not force:
+            return
+        conn = _thread_connection()
+        # Persistent in the file: readers no longer wait for writers, nor writers for readers
+        conn.execute("PRAGMA journal_mode = WAL")
+        if force or conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            try:
+                _migrate(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        _detect_schema(conn)
+        _initialized = True
 
-def init_database():
-    conn = sqlite3.connect(DATABASE_PATH)
+def _thread_connection() -> sqlite3.Connection:
+    pooled = getattr(_local, "pooled", None)
+    if pooled is None or pooled.closed:
+        # Only this thread uses it; other threads may close it at shutdown
+        conn = sqlite3.connect(
+            DATABASE_PATH,
+            timeout=DATABASE_BUSY_TIMEOUT,
+            cached_statements=DATABASE_STATEMENT_CACHE,
+            check_same_thread=False,
+        )
+        # In WAL mode NORMAL sync loses no committed data on a crash, only on power loss
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{DATABASE_CACHE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {DATABASE_MMAP_BYTES}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        pooled = _local.pooled = _PooledConnection(conn)
+        with _pool_lock:
+            _pool.add(pooled)
+    return pooled.conn
+
+@contextmanager
+def _connect():
+    """This thread's pooled connection; changes left uncommitted by a failure are rolled back"""
+    # Processes that never imported main, such as pool workers, initialize on first use
+    if not _initialized:
+        init_database()
+    conn = _thread_connection()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+
+def close_connections():
+    """Write buffered cache hits, then close every pooled connection; threads that query again open new ones"""
+    flush_cache_hits()
+    with _pool_lock:
+        pooled = list(_pool)
+        _pool.clear()
+    for holder in pooled:
+        holder.closed = True
+        holder.conn.close()
+
+def _detect_schema(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(documents)")}
+    # Older databases name the text column original_text; some have both
+    if 'original_text' in columns and 'text' in columns:
+        text_columns = ('original_text', 'text')
+    elif 'original_text' in columns:
+        text_columns = ('original_text',)
+    else:
+        text_columns = ('text',)
+    fields = ('filename',) + text_columns + ('summary', 'summary_type', 'summary_length', 'analysis_data', 'file_size', 'word_count')
+    _schema.update(
+        text_column=text_columns[0],
+        text_column_count=len(text_columns),
+        insert_document=f"INSERT INTO documents ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+    )
+
+def _migrate(conn):
     cursor = conn.cursor()
     
     # First, check if the table exists and get its schema
@@ -66,60 +183,127 @@ def init_database():
                 cursor.execute("ALTER TABLE documents ADD COLUMN word_count INTEGER DEFAULT 0")
                 print("Added word_count column")
     
-    conn.commit()
-    conn.close()
-
-def save_document(filename, text, summary="", summary_type="standard", summary_length="medium", analysis=None, file_size=0):
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
+    # Persistent tier of the analysis cache, keyed by content hash
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            content_hash TEXT PRIMARY KEY,
+            analysis_data TEXT NOT NULL,
+            hit_count INTEGER DEFAULT 0,
+            last_accessed REAL NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed ON analysis_cache (last_accessed)")
     
-    # Check which column name exists for the text field
-    cursor.execute("PRAGMA table_info(documents)")
-    columns = cursor.fetchall()
-    column_names = [col[1] for col in columns]
+    # Text extracted from uploaded files, keyed by file hash and extractor version
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS extraction_cache (
+            cache_key TEXT PRIMARY KEY,
+            text TEXT NOT NULL,
+            hit_count INTEGER DEFAULT 0,
+            last_accessed REAL NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_extraction_cache_accessed ON extraction_cache (last_accessed)")
+    
+    # Corpus-wide document frequencies for TF-IDF keyword ranking, maintained incrementally
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS term_document_frequency (
+            term TEXT PRIMARY KEY,
+            doc_count INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS document_terms (
+            document_id INTEGER NOT NULL,
+            term TEXT NOT NULL,
+            PRIMARY KEY (document_id, term)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS corpus_stats (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
     
+    cursor.execute("SELECT value FROM corpus_stats WHERE key = 'document_count'")
+    if cursor.fetchone() is None:
+        _build_term_index(cursor)
+
+def _text_column(cursor) -> str:
+    cursor.execute("PRAGMA table_info(documents)")
+    column_names = [col[1] for col in cursor.fetchall()]
+    return 'original_text' if 'original_text' in column_names else 'text'
+
+def _build_term_index(cursor):
+    """Index documents saved before the term index existed (runs once)"""
+    cursor.execute("DELETE FROM term_document_frequency")
+    cursor.execute("DELETE FROM document_terms")
+    cursor.execute(f"SELECT id, {_text_column(cursor)} FROM documents")
+    rows = cursor.fetchall()
+    cursor.execute("INSERT OR REPLACE INTO corpus_stats (key, value) VALUES ('document_count', 0)")
+    for document_id, text in rows:
+        _index_document_terms(cursor, document_id, text or "")
+    if rows:
+        print(f"Indexed terms of {len(rows)} existing documents")
+
+def _document_terms(text: str) -> List[str]:
+    """Distinct keyword candidates of a document, as counted by extract_keywords"""
+    return list(scan_text(text).keyword_counts)
+
+def _index_document_terms(cursor, document_id, text):
+    terms = _document_terms(text)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO document_terms (document_id, term) VALUES (?, ?)",
+        ((document_id, term) for term in terms)
+    )
+    cursor.executemany(
+        "INSERT INTO term_document_frequency (term, doc_count) VALUES (?, 1) "
+        "ON CONFLICT(term) DO UPDATE SET doc_count = doc_count + 1",
+        ((term,) for term in terms)
+    )
+    cursor.execute("UPDATE corpus_stats SET value = value + 1 WHERE key = 'document_count'")
+
+def _unindex_document_terms(cursor, document_id):
+    cursor.execute("SELECT term FROM document_terms WHERE document_id = ?", (document_id,))
+    terms = [row[0] for row in cursor.fetchall()]
+    cursor.executemany(
+        "UPDATE term_document_frequency SET doc_count = doc_count - 1 WHERE term = ?",
+        ((term,) for term in terms)
+    )
+    cursor.executemany(
+        "DELETE FROM term_document_frequency WHERE term = ? AND doc_count <= 0",
+        ((term,) for term in terms)
+    )
+    cursor.execute("DELETE FROM document_terms WHERE document_id = ?", (document_id,))
+    cursor.execute("UPDATE corpus_stats SET value = MAX(0, value - 1) WHERE key = 'document_count'")
+
+def save_document(filename, text, summary="", summary_type="standard", summary_length="medium", analysis=None, file_size=0):
     analysis_json = json.dumps(analysis) if analysis else None
     word_count = len(text.split()) if text else 0
     
-    # Build dynamic query based on available columns
-    # Handle both 'original_text' and 'text' columns
-    if 'original_text' in column_names and 'text' in column_names:
-        # Both columns exist - insert into both to avoid NOT NULL constraint
-        query = """
-            INSERT INTO documents (filename, original_text, text, summary, summary_type, summary_length, analysis_data, file_size, word_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cursor.execute(query, (filename, text, text, summary, summary_type, summary_length, analysis_json, file_size, word_count))
-    elif 'original_text' in column_names:
-        # Only original_text column exists
-        query = """
-            INSERT INTO documents (filename, original_text, summary, summary_type, summary_length, analysis_data, file_size, word_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cursor.execute(query, (filename, text, summary, summary_type, summary_length, analysis_json, file_size, word_count))
-    else:
-        # Only text column exists or default
-        query = """
-            INSERT INTO documents (filename, text, summary, summary_type, summary_length, analysis_data, file_size, word_count)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        cursor.execute(query, (filename, text, summary, summary_type, summary_length, analysis_json, file_size, word_count))
-    
-    document_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with _connect() as conn:
+        cursor = conn.cursor()
+        # The text goes into every text column the table has, see _detect_schema
+        texts = (text,) * _schema["text_column_count"]
+        cursor.execute(
+            _schema["insert_document"],
+            (filename,) + texts + (summary, summary_type, summary_length, analysis_json, file_size, word_count)
+        )
+        document_id = cursor.lastrowid
+        _index_document_terms(cursor, document_id, text or "")
+        conn.commit()
     
     return document_id
 
 def get_document(document_id):
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM documents WHERE id = ?", (document_id,))
-    row = cursor.fetchone()
-    
-    conn.close()
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("SELECT * FROM documents WHERE id = ?", (document_id,))
+        row = cursor.fetchone()
     
     if row:
         doc = dict(row)
@@ -132,14 +316,11 @@ def get_document(document_id):
     return None
 
 def get_all_documents(limit=50, offset=0):
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM documents ORDER BY created_at DESC LIMIT ? OFFSET ?", (limit, offset))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("SELECT * FROM documents ORDER BY created_at DESC LIMIT ? OFFSET ?", (limit, offset))
+        rows = cursor.fetchall()
     
     docs = []
     for row in rows:
@@ -152,23 +333,13 @@ def get_all_documents(limit=50, offset=0):
     return docs
 
 def search_documents(query, limit=20):
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Check which column name exists for the text field
-    cursor.execute("PRAGMA table_info(documents)")
-    columns = cursor.fetchall()
-    column_names = [col[1] for col in columns]
-    
-    text_column = 'original_text' if 'original_text' in column_names else 'text'
-    
     search_term = f"%{query}%"
-    search_query = f"SELECT * FROM documents WHERE filename LIKE ? OR {text_column} LIKE ? ORDER BY created_at DESC LIMIT ?"
-    cursor.execute(search_query, (search_term, search_term, limit))
-    
-    rows = cursor.fetchall()
-    conn.close()
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        search_query = f"SELECT * FROM documents WHERE filename LIKE ? OR {_schema['text_column']} LIKE ? ORDER BY created_at DESC LIMIT ?"
+        cursor.execute(search_query, (search_term, search_term, limit))
+        rows = cursor.fetchall()
     
     docs = []
     for row in rows:
@@ -181,35 +352,32 @@ def search_documents(query, limit=20):
     return docs
 
 def delete_document(document_id):
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("DELETE FROM documents WHERE id = ?", (document_id,))
-    
-    conn.commit()
-    conn.close()
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM documents WHERE id = ?", (document_id,))
+        if cursor.rowcount:
+            _unindex_document_terms(cursor, document_id)
+        conn.commit()
 
 def get_document_stats():
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Get total documents
-    cursor.execute("SELECT COUNT(*) as total_documents FROM documents")
-    total_docs = cursor.fetchone()[0]
-    
-    # Get total words processed
-    cursor.execute("SELECT SUM(word_count) as total_words FROM documents")
-    total_words = cursor.fetchone()[0] or 0
-    
-    # Get recent documents count (last 7 days)
-    cursor.execute("SELECT COUNT(*) as recent_docs FROM documents WHERE created_at >= datetime('now', '-7 days')")
-    recent_docs = cursor.fetchone()[0]
-    
-    # Get average document length
-    cursor.execute("SELECT AVG(word_count) as avg_words FROM documents")
-    avg_words = cursor.fetchone()[0] or 0
-    
-    conn.close()
+    with _connect() as conn:
+        cursor = conn.cursor()
+        
+        # Get total documents
+        cursor.execute("SELECT COUNT(*) as total_documents FROM documents")
+        total_docs = cursor.fetchone()[0]
+        
+        # Get total words processed
+        cursor.execute("SELECT SUM(word_count) as total_words FROM documents")
+        total_words = cursor.fetchone()[0] or 0
+        
+        # Get recent documents count (last 7 days)
+        cursor.execute("SELECT COUNT(*) as recent_docs FROM documents WHERE created_at >= datetime('now', '-7 days')")
+        recent_docs = cursor.fetchone()[0]
+        
+        # Get average document length
+        cursor.execute("SELECT AVG(word_count) as avg_words FROM documents")
+        avg_words = cursor.fetchone()[0] or 0
     
     return {
         "total_documents": total_docs,
@@ -226,13 +394,182 @@ def add_document_tag(document_id, tag):
     # Placeholder for tags functionality
     pass
 
+# Cache hits are counted in memory and written in one transaction per flush, so cache
+# lookups never take the write lock. Each process flushes its hits within this many
+# seconds, before it stores (and evicts) an entry, and at exit
+CACHE_HIT_FLUSH_SECONDS = float(os.environ.get("CACHE_HIT_FLUSH_SECONDS", 5))
+CACHE_KEY_COLUMNS = {"analysis_cache": "content_hash", "extraction_cache": "cache_key"}
+
+_pending_hits = {}
+_hits_lock = threading.Lock()
+_flusher_pid = None
+
+def _record_hit(table, key):
+    global _flusher_pid
+    with _hits_lock:
+        hits, _ = _pending_hits.get((table, key), (0, 0.0))
+        _pending_hits[table, key] = (hits + 1, time.time())
+        # One flusher per process; a forked child inherits the pid but not the thread
+        start_flusher = _flusher_pid != os.getpid()
+        if start_flusher:
+            _flusher_pid = os.getpid()
+    if start_flusher:
+        threading.Thread(target=_flush_periodically, name="cache-hit-flush", daemon=True).start()
+
+def _flush_periodically():
+    while True:
+        time.sleep(CACHE_HIT_FLUSH_SECONDS)
+        try:
+            flush_cache_hits()
+        except sqlite3.Error as e:
+            print(f"Could not write cache hits: {str(e)}")
+
+def _take_hits() -> List:
+    with _hits_lock:
+        pending = list(_pending_hits.items())
+        _pending_hits.clear()
+    return pending
+
+def _write_hits(conn, pending: List):
+    """Add buffered hits to the stored counts and access times; the caller commits"""
+    for table, column in CACHE_KEY_COLUMNS.items():
+        rows = [(hits, accessed, key) for (hit_table, key), (hits, accessed) in pending if hit_table == table]
+        if rows:
+            conn.executemany(
+                f"UPDATE {table} SET hit_count = hit_count + ?, last_accessed = MAX(last_accessed, ?) WHERE {column} = ?",
+                rows
+            )
+
+def flush_cache_hits():
+    """Write this process's buffered cache hits in one transaction"""
+    pending = _take_hits()
+    if pending:
+        with _connect() as conn:
+            _write_hits(conn, pending)
+            conn.commit()
+
+# CPU pool workers look up the analysis cache too; their last hits are written as they exit
+atexit.register(flush_cache_hits)
+
+def get_cached_analysis(content_hash):
+    with _connect() as conn:
+        row = conn.execute("SELECT analysis_data FROM analysis_cache WHERE content_hash = ?", (content_hash,)).fetchone()
+        if row:
+            _record_hit("analysis_cache", content_hash)
+    
+    return row[0] if row else None
+
+def save_cached_analysis(content_hash, analysis_json):
+    with _connect() as conn:
+        # This process's recent hits first, so eviction sees their access times
+        _write_hits(conn, _take_hits())
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_cache (content_hash, analysis_data, hit_count, last_accessed) VALUES (?, ?, 0, ?)",
+            (content_hash, analysis_json, time.time())
+        )
+        
+        # Evict least recently used entries beyond the size bound
+        conn.execute("""
+            DELETE FROM analysis_cache WHERE content_hash IN (
+                SELECT content_hash FROM analysis_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        """, (ANALYSIS_CACHE_MAX_ENTRIES,))
+        
+        conn.commit()
+
+def get_analysis_cache_stats():
+    flush_cache_hits()
+    with _connect() as conn:
+        entries, total_hits = conn.execute("SELECT COUNT(*), COALESCE(SUM(hit_count), 0) FROM analysis_cache").fetchone()
+    
+    return {
+        "size": entries,
+        "max_size": ANALYSIS_CACHE_MAX_ENTRIES,
+        "stored_hits": total_hits
+    }
+
+def get_cached_extraction(cache_key):
+    with _connect() as conn:
+        row = conn.execute("SELECT text FROM extraction_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+        if row:
+            _record_hit("extraction_cache", cache_key)
+    
+    return row[0] if row else None
+
+def save_cached_extraction(cache_key, text):
+    with _connect() as conn:
+        # This process's recent hits first, so eviction sees their access times
+        _write_hits(conn, _take_hits())
+        conn.execute(
+            "INSERT OR REPLACE INTO extraction_cache (cache_key, text, hit_count, last_accessed) VALUES (?, ?, 0, ?)",
+            (cache_key, text, time.time())
+        )
+        
+        # Evict least recently used entries beyond the size bound
+        conn.execute("""
+            DELETE FROM extraction_cache WHERE cache_key IN (
+                SELECT cache_key FROM extraction_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        """, (EXTRACTION_CACHE_MAX_ENTRIES,))
+        
+        conn.commit()
+
+def get_extraction_cache_stats():
+    flush_cache_hits()
+    with _connect() as conn:
+        entries, total_hits, total_chars = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(hit_count), 0), COALESCE(SUM(LENGTH(text)), 0) FROM extraction_cache"
+        ).fetchone()
+    
+    return {
+        "size": entries,
+        "max_size": EXTRACTION_CACHE_MAX_ENTRIES,
+        "stored_hits": total_hits,
+        "stored_chars": total_chars
+    }
+
+# SQLite's default limit on bound parameters per statement is 999 on older builds
+TERM_LOOKUP_BATCH = 900
+
+def get_corpus_size() -> int:
+    with _connect() as conn:
+        row = conn.execute("SELECT value FROM corpus_stats WHERE key = 'document_count'").fetchone()
+    
+    return row[0] if row else 0
+
+def get_document_frequencies(terms: Iterable[str]) -> Tuple[int, Dict[str, int]]:
+    """Corpus size and the number of documents containing each term (absent terms are omitted)"""
+    terms = list(terms)
+    frequencies = {}
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM corpus_stats WHERE key = 'document_count'")
+        row = cursor.fetchone()
+        corpus_size = row[0] if row else 0
+        
+        if corpus_size:
+            for start in range(0, len(terms), TERM_LOOKUP_BATCH):
+                batch = terms[start:start + TERM_LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(f"SELECT term, doc_count FROM term_document_frequency WHERE term IN ({placeholders})", batch)
+                frequencies.update(cursor.fetchall())
+    
+    return corpus_size, frequencies
+
 def reset_database():
-    """Force reset the database schema"""
-    if DATABASE_PATH.exists():
-        DATABASE_PATH.unlink()
-        print("Deleted existing database")
-    init_database()
+    """Force reset the database schema.
+    
+    Tables are dropped in place rather than the file deleted, so connections
+    pooled in other threads and processes stay valid.
+    """
+    with _connect() as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        for table in tables:
+            conn.execute(f'DROP TABLE "{table}"')
+        conn.commit()
+        # Return the freed pages to the file system
+        conn.execute("VACUUM")
+    _take_hits()
+    print("Dropped existing tables")
+    init_database(force=True)
     print("Database reset complete")
-
-# Initialize database on import
-init_database()
@@ -0,0 +1,212 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+# CPU-bound stages (analysis, summaries, rendering) run in worker processes so they never hold
+# the event loop's GIL; blocking I/O (SQLite, file reads, extraction) runs in threads
+CPU_WORKERS = int(os.environ.get("CPU_WORKERS", os.cpu_count() or 1))
+IO_WORKERS = int(os.environ.get("IO_WORKERS", 16))
+# Tasks running or waiting per pool; beyond this requests are refused with 503 instead of queueing
+CPU_QUEUE_LIMIT = int(os.environ.get("CPU_QUEUE_LIMIT", 4 * CPU_WORKERS))
+IO_QUEUE_LIMIT = int(os.environ.get("IO_QUEUE_LIMIT", 4 * IO_WORKERS))
+OVERLOAD_RETRY_AFTER = int(os.environ.get("OVERLOAD_RETRY_AFTER", 2))
+# spawn: workers start from a clean interpreter, not a fork of a process with busy threads and locks
+CPU_POOL_START_METHOD = os.environ.get("CPU_POOL_START_METHOD", "spawn")
+
+_in_worker = False
+_thread_state = threading.local()
+_worker_setup: Optional[Callable] = None
+
+class Overloaded(HTTPException):
+    def __init__(self, pool: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy ({pool} queue is full), try again shortly",
+            headers={"Retry-After": str(OVERLOAD_RETRY_AFTER)},
+        )
+
+class BoundedExecutor:
+    """A lazily created executor that refuses work once queue_limit tasks are running or waiting.
+
+    A task holds its slot until it actually finishes, even if the request that
+    submitted it was cancelled. If the executor cannot be used here (processes
+    unavailable), work moves to the executor made by fallback, when given.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Executor], queue_limit: int,
+                 fallback: Optional[Callable[[], Executor]] = None):
+        self.name = name
+        self.factory = factory
+        self.fallback = fallback
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self.factory()
+            return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        return await self.submit(fn, *args, **kwargs)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> asyncio.Future:
+        """Admit fn now, raising Overloaded if the queue is full, and return a future of its result.
+        
+        Must be called on the event loop. Lets a caller learn it was refused
+        before it commits to a response, then await the result later.
+        """
+        with self._lock:
+            if self.in_flight >= self.queue_limit:
+                self.rejected += 1
+                raise Overloaded(self.name)
+            self.in_flight += 1
+        try:
+            future = self._submit(fn, *args, **kwargs)
+        except BaseException:
+            self._finished(None)
+            raise
+        future.add_done_callback(self._finished)
+        result = asyncio.wrap_future(future)
+        result.add_done_callback(self._check_broken)
+        return result
+
+    def _check_broken(self, result: asyncio.Future):
+        if not result.cancelled() and isinstance(result.exception(), BrokenProcessPool):
+            # A worker died (out of memory, killed); start a fresh pool for the next request
+            self.reset()
+
+    def _submit(self, fn: Callable, *args, **kwargs) -> Future:
+        try:
+            return self.executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self.reset()
+            return self.executor.submit(fn, *args, **kwargs)
+        except (OSError, NotImplementedError) as e:
+            # Some serverless sandboxes cannot start processes or create the semaphores they need
+            if self.fallback is None:
+                raise
+            print(f"{self.name} pool unavailable, using the fallback executor: {str(e)}")
+            self.factory, self.fallback = self.fallback, None
+            self.reset()
+            return self.executor.submit(fn, *args, **kwargs)
+
+    def _finished(self, future: Optional[Future]):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "queue_limit": self.queue_limit,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def reset(self):
+        """Shut the executor down; the next task starts a new one"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def _init_worker(setup: Optional[Callable]):
+    global _in_worker
+    _in_worker = True
+    if setup is not None:
+        try:
+            setup()
+        except Exception as e:
+            # A worker without warm caches still serves requests
+            print(f"CPU worker setup failed: {str(e)}")
+
+def _process_pool() -> Executor:
+    return ProcessPoolExecutor(
+        max_workers=CPU_WORKERS,
+        mp_context=multiprocessing.get_context(CPU_POOL_START_METHOD),
+        initializer=_init_worker,
+        initargs=(_worker_setup,),
+    )
+
+def _thread_pool(workers: int, prefix: str) -> Callable[[], Executor]:
+    return lambda: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=prefix)
+
+_cpu = BoundedExecutor("cpu", _process_pool, CPU_QUEUE_LIMIT, fallback=_thread_pool(CPU_WORKERS, "cpu"))
+_io = BoundedExecutor("io", _thread_pool(IO_WORKERS, "io"), IO_QUEUE_LIMIT)
+
+async def run_cpu(fn: Callable, *args, **kwargs):
+    """Run fn in the process pool; fn and its arguments must be picklable"""
+    return await _cpu.run(fn, *args, **kwargs)
+
+async def run_io(fn: Callable, *args, **kwargs):
+    """Run blocking fn in the I/O thread pool"""
+    return await _io.run(fn, *args, **kwargs)
+
+def submit_cpu(fn: Callable, *args, **kwargs) -> asyncio.Future:
+    """run_cpu, admitted now (raising Overloaded) and awaited later"""
+    return _cpu.submit(fn, *args, **kwargs)
+
+def submit_io(fn: Callable, *args, **kwargs) -> asyncio.Future:
+    """run_io, admitted now (raising Overloaded) and awaited later"""
+    return _io.submit(fn, *args, **kwargs)
+
+def call_async(fn: Callable, *args):
+    """Run coroutine function fn to completion on this thread's event loop; lets pools run the async summary builders.
+    
+    The loop outlives the call, so clients bound to it, such as the inference
+    client's keep-alive connections, serve the thread's later tasks too.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None:
+        loop = _thread_state.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(fn(*args))
+
+def cpu_pool() -> Optional[Executor]:
+    """The process pool for fanning one task out further, or None inside a worker, which cannot start its own.
+
+    Work mapped on it bypasses the queue limit, so callers must themselves be
+    admitted through run_cpu or run_io.
+    """
+    return None if _in_worker else _cpu.executor
+
+def reset_cpu_pool():
+    """Drop a broken process pool so the next task starts a fresh one"""
+    _cpu.reset()
+
+def set_worker_setup(fn: Callable):
+    """Run fn in every CPU worker as it starts, to warm that process's own caches.
+    
+    fn must be a module-level function; pools started before this call keep
+    the previous setup until they are reset.
+    """
+    global _worker_setup
+    _worker_setup = fn
+
+def in_worker_process() -> bool:
+    return _in_worker
+
+def warm_cpu_pool(fn: Callable):
+    """Start the CPU workers now, running fn once per worker, so the first requests skip process start-up"""
+    pool = _cpu.executor
+    for future in [pool.submit(fn) for _ in range(CPU_WORKERS)]:
+        future.result()
+
+def get_executor_stats() -> Dict:
+    return {"cpu": dict(_cpu.stats(), workers=CPU_WORKERS), "io": dict(_io.stats(), workers=IO_WORKERS)}
+
+def shutdown_executors():
+    _cpu.reset()
+    _io.reset()
@@ -1,32 +1,27 @@
 from datetime import datetime
 from io import BytesIO
 
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+from lazy_imports import load_module, module_available
 
-try:
-    from docx import Document
-    from docx.shared import Inches
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+# reportlab and python-docx are imported on the first export, not at startup
+REPORTLAB_AVAILABLE = module_available("reportlab")
+DOCX_AVAILABLE = module_available("docx")
 
 def export_to_pdf(content: str, title: str = "Document Summary") -> bytes:
     if not REPORTLAB_AVAILABLE:
         raise Exception("PDF export not available")
     
+    letter = load_module("reportlab.lib.pagesizes").letter
+    styles_module = load_module("reportlab.lib.styles")
+    platypus = load_module("reportlab.platypus")
+    SimpleDocTemplate, Paragraph, Spacer = platypus.SimpleDocTemplate, platypus.Paragraph, platypus.Spacer
+    
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
                            topMargin=72, bottomMargin=18)
     
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
+    styles = styles_module.getSampleStyleSheet()
+    title_style = styles_module.ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
         fontSize=18,
@@ -57,7 +52,7 @@ def export_to_docx(content: str, title: str = "Document Summary") -> bytes:
     if not DOCX_AVAILABLE:
         raise Exception("DOCX export not available")
     
-    doc = Document()
+    doc = load_module("docx").Document()
     doc.add_heading(title, 0)
     
     lines = content.split('\n')
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+from lazy_imports import load_module
+
+# Point HF_API_URL at a local stand-in server to test without the hosted model
+HF_API_URL = os.environ.get("HF_API_URL", "https://api-inference.huggingface.co/models/facebook/bart-large-cnn")
+HF_API_TOKEN = os.environ.get("HF_API_TOKEN")
+
+INFERENCE_TIMEOUT = float(os.environ.get("INFERENCE_TIMEOUT", 45))
+INFERENCE_MAX_CONNECTIONS = int(os.environ.get("INFERENCE_MAX_CONNECTIONS", 10))
+# Requests in flight at once; further batches wait for a slot
+INFERENCE_CONCURRENCY = int(os.environ.get("INFERENCE_CONCURRENCY", 4))
+INFERENCE_RETRIES = int(os.environ.get("INFERENCE_RETRIES", 3))
+INFERENCE_BACKOFF = float(os.environ.get("INFERENCE_BACKOFF", 0.5))
+INFERENCE_MAX_BACKOFF = float(os.environ.get("INFERENCE_MAX_BACKOFF", 10))
+# Consecutive failed requests that open the circuit, and seconds before a trial request
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.environ.get("CIRCUIT_RESET_SECONDS", 30))
+# Inputs with the same parameters arriving within the window share one request
+INFERENCE_BATCH_SIZE = int(os.environ.get("INFERENCE_BATCH_SIZE", 8))
+INFERENCE_BATCH_WINDOW = float(os.environ.get("INFERENCE_BATCH_WINDOW_MS", 20)) / 1000
+
+# Rate limiting, model still loading, and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class InferenceError(Exception):
+    pass
+
+class CircuitBreaker:
+    """Fails fast after repeated failures, then lets one trial request through per reset period"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        # One breaker serves every event loop and worker thread
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_seconds:
+                # Half-open: this request is the trial, everyone else waits another period
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class _LoopState:
+    """What the callers on one event loop share: the HTTP client, the concurrency limit and pending batches"""
+
+    def __init__(self):
+        # httpx is imported by the first abstractive summary, not at startup
+        httpx = load_module("httpx")
+        self.client = httpx.AsyncClient(
+            timeout=INFERENCE_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=INFERENCE_MAX_CONNECTIONS,
+                max_keepalive_connections=INFERENCE_MAX_CONNECTIONS,
+            ),
+        )
+        self.semaphore = asyncio.Semaphore(INFERENCE_CONCURRENCY)
+        self.pending = {}
+        self.tasks = set()
+
+class InferenceClient:
+    """Async client for the summarization model with a pooled keep-alive connection.
+
+    Concurrent summarize() calls with the same parameters are micro-batched into
+    one request with a list of inputs. Requests are limited to INFERENCE_CONCURRENCY
+    at a time, retried with exponential backoff and full jitter, and short-circuited
+    while the model keeps failing.
+    """
+
+    def __init__(self, url: str = HF_API_URL, token: Optional[str] = HF_API_TOKEN):
+        self.url = url
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.breaker = CircuitBreaker()
+        self.requests = 0
+        self.batched_inputs = 0
+        self.retries = 0
+        # The API's loop and each pool thread's long-lived loop get their own state,
+        # dropped with the loop
+        self._states = weakref.WeakKeyDictionary()
+        self._states_lock = threading.Lock()
+
+    def _bind(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = self._states[loop] = _LoopState()
+        return state
+
+    async def summarize(self, text: str, parameters: Dict) -> str:
+        """Summary text for one input, sent together with other inputs waiting for the same parameters"""
+        state = self._bind()
+        loop = asyncio.get_running_loop()
+        key = json.dumps(parameters, sort_keys=True)
+        future = loop.create_future()
+        batch = state.pending.setdefault(key, [])
+        batch.append((text, future))
+        if len(batch) >= INFERENCE_BATCH_SIZE:
+            self._flush(state, key, parameters)
+        elif len(batch) == 1:
+            loop.call_later(INFERENCE_BATCH_WINDOW, self._flush, state, key, parameters)
+        return await future
+
+    def _flush(self, state: _LoopState, key: str, parameters: Dict):
+        batch = state.pending.pop(key, None)
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(state, batch, parameters))
+            state.tasks.add(task)
+            task.add_done_callback(state.tasks.discard)
+
+    async def _run_batch(self, state: _LoopState, batch: List, parameters: Dict):
+        inputs = [text for text, _ in batch]
+        try:
+            result = await self._post(state, inputs if len(inputs) > 1 else inputs[0], parameters)
+            if not isinstance(result, list) or len(result) != len(inputs):
+                raise InferenceError(f"Expected {len(inputs)} summaries, got {result!r:.200}")
+            outcomes = [item.get("summary_text", "") if isinstance(item, dict) else "" for item in result]
+        except Exception as e:
+            outcomes = [e] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            # A caller may have been cancelled while the request was in flight
+            if not future.done():
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    async def _post(self, state: _LoopState, inputs, parameters: Dict):
+        httpx = load_module("httpx")
+        if not self.breaker.allow():
+            raise InferenceError("Summarization service unavailable (circuit open)")
+        payload = {"inputs": inputs, "parameters": parameters}
+        self.requests += 1
+        self.batched_inputs += len(inputs) if isinstance(inputs, list) else 1
+        error = None
+        for attempt in range(INFERENCE_RETRIES + 1):
+            retry_after = None
+            try:
+                async with state.semaphore:
+                    response = await state.client.post(self.url, json=payload, headers=self.headers)
+            except httpx.TransportError as e:
+                error = e
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return response.json()
+                error = InferenceError(f"Summarization service returned {response.status_code}: {response.text[:200]}")
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # The request itself is bad; the service is fine
+                    raise error
+                retry_after = _retry_after(response)
+            if attempt < INFERENCE_RETRIES:
+                self.retries += 1
+                delay = random.uniform(0, min(INFERENCE_MAX_BACKOFF, INFERENCE_BACKOFF * 2 ** attempt))
+                await asyncio.sleep(max(delay, retry_after or 0))
+        self.breaker.record_failure()
+        raise InferenceError(f"Summarization failed after {INFERENCE_RETRIES + 1} attempts: {error}") from error
+
+    def stats(self) -> Dict:
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "batched_inputs": self.batched_inputs,
+            "retries": self.retries,
+            "circuit": self.breaker.state,
+        }
+
+    async def aclose(self):
+        """Close the running loop's client; each pool thread keeps its own for the thread's lifetime"""
+        with self._states_lock:
+            state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.client.aclose()
+
+def _retry_after(response) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, capped at INFERENCE_MAX_BACKOFF"""
+    try:
+        return min(INFERENCE_MAX_BACKOFF, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+_client = None
+
+def get_inference_client() -> InferenceClient:
+    global _client
+    if _client is None:
+        _client = InferenceClient()
+    return _client
+
+async def close_inference_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,43 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Dict
+
+# First-import times of lazily loaded modules and the startup phases, in milliseconds
+_import_times: Dict[str, float] = {}
+_startup_times: Dict[str, float] = {}
+_lock = threading.Lock()
+
+def module_available(name: str) -> bool:
+    """Whether name can be imported, found without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def load_module(name: str) -> ModuleType:
+    """Import name on first use, recording how long that first import took"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _import_times.setdefault(name, round((time.perf_counter() - started) * 1000, 1))
+    return module
+
+def record_startup(phase: str, started: float):
+    """Record a startup phase that began at perf_counter() value started"""
+    with _lock:
+        _startup_times[phase] = round((time.perf_counter() - started) * 1000, 1)
+
+def get_import_report() -> Dict:
+    """Cold-start phases and the deferred imports paid by the first requests that needed them.
+    
+    Times are this process's; CPU pool workers pay their own lazy imports.
+    """
+    with _lock:
+        return {"startup_ms": dict(_startup_times), "lazy_imports_ms": dict(_import_times)}
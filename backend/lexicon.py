@@ -0,0 +1,237 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+POSITIVE_WORDS = [
+    'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'positive',
+    'success', 'achieve', 'benefit', 'improve', 'effective', 'efficient'
+]
+
+NEGATIVE_WORDS = [
+    'bad', 'terrible', 'awful', 'horrible', 'negative', 'fail', 'problem',
+    'issue', 'difficult', 'challenge', 'concern', 'risk', 'threat'
+]
+
+KEYWORD_STOP_WORDS = [
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'her', 'was', 'one',
+    'had', 'use', 'his', 'has', 'who', 'oil', 'its', 'now', 'how', 'did', 'get', 'may',
+    'him', 'old', 'see', 'two', 'way', 'she', 'day', 'man', 'boy', 'new', 'let', 'put'
+]
+
+SUMMARY_STOP_WORDS = [
+    'this', 'that', 'these', 'those', 'with', 'from', 'they', 'them', 'their',
+    'would', 'could', 'should', 'will', 'been', 'have', 'had', 'has', 'was',
+    'were', 'are', 'is', 'be', 'being', 'do', 'does', 'did', 'done', 'the',
+    'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'as', 'by'
+]
+
+# Optional domain dictionaries, loaded once on first use
+SENTIMENT_LEXICON_PATH = os.environ.get("SENTIMENT_LEXICON_PATH")
+STOPWORDS_PATH = os.environ.get("STOPWORDS_PATH")
+
+class Lexicon:
+    """Sentiment terms and stopwords compiled for one-pass document scoring.
+
+    Single-word terms live in a hash map from token to polarity (+1/-1), so a
+    document is scored with one lookup per distinct token. Multi-word phrases are
+    compiled into a token trie and matched over the token stream only when a
+    document contains the first word of some phrase.
+    """
+
+    def __init__(self, positive: Iterable[str], negative: Iterable[str],
+                 keyword_stop_words: Iterable[str], summary_stop_words: Iterable[str]):
+        self.polarity = {}
+        self.phrases = {}
+        self.max_phrase_length = 1
+        for terms, polarity in ((positive, 1), (negative, -1)):
+            for term in terms:
+                self.add_term(term, polarity)
+
+        self.keyword_stop_words = frozenset(keyword_stop_words)
+        self.summary_stop_words = frozenset(summary_stop_words)
+
+    def add_term(self, term: str, polarity: int):
+        tokens = term.lower().split()
+        if not tokens:
+            return
+        if len(tokens) == 1:
+            self.polarity[tokens[0]] = polarity
+            return
+
+        # Trie nodes are [children, polarity]; polarity 0 marks a non-terminal node
+        node = self.phrases.setdefault(tokens[0], [{}, 0])
+        for token in tokens[1:]:
+            node = node[0].setdefault(token, [{}, 0])
+        node[1] = polarity
+        self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+    @property
+    def has_phrases(self) -> bool:
+        return bool(self.phrases)
+
+    def count_words(self, lower_counts: Dict[str, int]) -> Tuple[int, int]:
+        """Positive and negative single-word hits, from per-token frequencies"""
+        positive = negative = 0
+        if len(self.polarity) < len(lower_counts):
+            items = ((term, lower_counts.get(term, 0), polarity) for term, polarity in self.polarity.items())
+        else:
+            polarity_of = self.polarity.get
+            items = ((term, n, polarity_of(term, 0)) for term, n in lower_counts.items())
+        for _, n, polarity in items:
+            if polarity > 0:
+                positive += n
+            elif polarity < 0:
+                negative += n
+        return positive, negative
+
+    def may_match_phrases(self, tokens: Iterable[str]) -> bool:
+        return self.has_phrases and not self.phrases.keys().isdisjoint(tokens)
+
+def _read_lines(file_path: str) -> List[str]:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def _load_sentiment_file(file_path: str) -> Tuple[List[str], List[str]]:
+    """Read 'term<TAB>label' lines, where label is positive/negative or a signed score"""
+    positive, negative = [], []
+    for line in _read_lines(file_path):
+        term, _, label = line.rpartition('\t')
+        if not term:
+            continue
+        label = label.strip().lower()
+        if label in ('positive', 'pos', '+'):
+            positive.append(term)
+        elif label in ('negative', 'neg', '-'):
+            negative.append(term)
+        else:
+            try:
+                score = float(label)
+            except ValueError:
+                continue
+            if score > 0:
+                positive.append(term)
+            elif score < 0:
+                negative.append(term)
+    return positive, negative
+
+def load_lexicon(sentiment_path: Optional[str] = None, stopwords_path: Optional[str] = None) -> Lexicon:
+    positive, negative = list(POSITIVE_WORDS), list(NEGATIVE_WORDS)
+    keyword_stop_words, summary_stop_words = list(KEYWORD_STOP_WORDS), list(SUMMARY_STOP_WORDS)
+
+    if sentiment_path:
+        extra_positive, extra_negative = _load_sentiment_file(sentiment_path)
+        positive += extra_positive
+        negative += extra_negative
+    if stopwords_path:
+        extra = [word.lower() for word in _read_lines(stopwords_path)]
+        keyword_stop_words += extra
+        summary_stop_words += extra
+
+    return Lexicon(positive, negative, keyword_stop_words, summary_stop_words)
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def get_lexicon() -> Lexicon:
+    """The process-wide lexicon, compiled once on first use"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = load_lexicon(SENTIMENT_LEXICON_PATH, STOPWORDS_PATH)
+    return _lexicon
+
+class PhraseCounter:
+    """Mergeable count of multi-word lexicon phrases over a token stream.
+
+    Every occurrence of a phrase adds its polarity, and each token covered by at
+    least one phrase occurrence stops counting as a single-word hit. The result is
+    kept as adjustments to the single-word counts. Only the first and last
+    (longest phrase - 1) tokens are kept, which is enough to find occurrences that
+    span the boundary when more tokens are fed or another counter is merged.
+    """
+
+    def __init__(self, lexicon: Lexicon):
+        self.lexicon = lexicon
+        self.window = lexicon.max_phrase_length - 1
+        self.positive = 0
+        self.negative = 0
+        self.token_count = 0
+        # Entries are [token, covered]; head and tail share entries when the stream is short
+        self.head = []
+        self.tail = []
+
+    def feed(self, tokens: List[str]):
+        if not tokens or not self.window:
+            return
+        count = len(tokens)
+        if count > 2 * self.window and not self.lexicon.may_match_phrases(tokens):
+            # Nothing to match here beyond the boundary, so only the edge tokens are kept
+            entries = [[token, False] for token in tokens[:self.window]]
+            entries += [[token, False] for token in tokens[-self.window:]]
+            self._match(self.tail, entries[:self.window], spanning_only=False)
+        else:
+            entries = [[token, False] for token in tokens]
+            self._match(self.tail, entries, spanning_only=False)
+        self._append(entries, count)
+
+    def merge(self, other: 'PhraseCounter'):
+        """Append the counts of the token stream that directly follows this one"""
+        if not other.token_count or not self.window:
+            return
+        # Occurrences inside the other stream are already counted there
+        self._match(self.tail, other.head, spanning_only=True)
+        self.positive += other.positive
+        self.negative += other.negative
+        self._append(other.head, other.token_count)
+        if other.token_count > self.window:
+            self.tail = other.tail
+
+    def _append(self, entries: List[list], count: int):
+        if len(self.head) < self.window:
+            self.head = self.head + entries[:self.window - len(self.head)]
+        self.tail = (self.tail + entries)[-self.window:]
+        self.token_count += count
+
+    def _match(self, before: List[list], entries: List[list], spanning_only: bool):
+        """Count occurrences that end within entries, given the preceding window"""
+        window = before + entries
+        lexicon = self.lexicon
+        if not lexicon.may_match_phrases(entry[0] for entry in window):
+            return
+
+        first_new = len(before)
+        phrases = lexicon.phrases
+        for start in range(first_new if spanning_only else len(window)):
+            node = phrases.get(window[start][0])
+            end = start + 1
+            while node is not None and end < len(window):
+                node = node[0].get(window[end][0])
+                if node is None:
+                    break
+                end += 1
+                if node[1] and end > first_new:
+                    self._count(node[1], window[start:end])
+
+    def _count(self, polarity: int, covered: List[list]):
+        if polarity > 0:
+            self.positive += 1
+        else:
+            self.negative += 1
+        # Tokens inside a phrase no longer count on their own
+        polarity_of = self.lexicon.polarity.get
+        for entry in covered:
+            if entry[1]:
+                continue
+            entry[1] = True
+            single = polarity_of(entry[0], 0)
+            if single > 0:
+                self.positive -= 1
+            elif single < 0:
+                self.negative -= 1
+
+def count_phrases(lexicon: Lexicon, tokens: List[str]) -> Tuple[int, int]:
+    """Phrase adjustments to the single-word counts for a complete token list"""
+    counter = PhraseCounter(lexicon)
+    counter.feed(tokens)
+    return counter.positive, counter.negative
@@ -1,22 +1,86 @@
+import time
+
+# Cold-start clock for the startup report; taken before the framework and app imports
+IMPORT_STARTED = time.perf_counter()
+
 import os
-import shutil
-import tempfile
+import json
 from typing import List, Optional
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 import utils
 import database
+import uploads
+
+utils.record_startup("imports", IMPORT_STARTED)
 
 load_dotenv()
 
 app = FastAPI(title="Document Summary Assistant")
 
-# Initialize database
+# Initialize database, the only time per process; later calls return at once
+database_started = time.perf_counter()
 database.init_database()
+utils.record_startup("database_init", database_started)
+
+@app.on_event("startup")
+async def load_lexicon():
+    # Compile the sentiment and stopword dictionaries before the first request needs them
+    try:
+        lexicon = utils.get_lexicon()
+        print(f"Loaded lexicon with {len(lexicon.polarity)} sentiment terms")
+    except Exception as e:
+        print(f"Could not load lexicon: {str(e)}")
+
+# Analysis and summaries run in CPU worker processes, each with its own lexicon and
+# word-feature cache; warm them as each worker starts
+utils.set_worker_setup(utils.prepare_process)
+
+@app.on_event("startup")
+async def preload_word_features():
+    # Optional word list used to warm this process's word-feature cache, for work
+    # that runs here (thread fallback of the CPU pool, I/O-path summaries)
+    if utils.WORD_LEXICON_PATH:
+        try:
+            loaded = utils.preload_configured_lexicon()
+            print(f"Preloaded {loaded} words from {utils.WORD_LEXICON_PATH}")
+        except Exception as e:
+            print(f"Could not preload word lexicon: {str(e)}")
+
+@app.on_event("startup")
+async def warm_up():
+    # Optional: import extractors and exporters and start the CPU workers before the first request
+    if os.environ.get("WARM_UP", "").lower() in ("1", "true", "yes"):
+        try:
+            await utils.run_io(utils.warm_up)
+        except Exception as e:
+            print(f"Warm-up failed: {str(e)}")
+    print(f"Startup times: {utils.get_import_report()}")
+
+@app.on_event("shutdown")
+async def stop_worker_pools():
+    # CPU process pool, blocking I/O threads and OCR threads
+    utils.shutdown_executors()
+    utils.shutdown_ocr_pool()
+    # Pooled SQLite connections, after buffered cache hits are written
+    database.close_connections()
+
+@app.on_event("shutdown")
+async def close_inference_client():
+    # Pooled keep-alive connections to the abstractive summarization model
+    await utils.close_inference_client()
+
+@app.middleware("http")
+async def limit_request_size(request, call_next):
+    # Refuse oversized bodies from the declared length, before they are read and parsed
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > uploads.MAX_UPLOAD_REQUEST_BYTES:
+        return JSONResponse(status_code=413, content={"detail": f"Request body exceeds {uploads.MAX_UPLOAD_REQUEST_BYTES:,} bytes"})
+    return await call_next(request)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,61 +93,174 @@ app.add_middleware(
 async def health():
     return {"status": "ok"}
 
+@app.get("/ocr/stats")
+async def ocr_stats():
+    # Throughput, rejections and per-page timings of the OCR pool
+    return utils.get_ocr_stats()
+
+@app.get("/startup/stats")
+async def startup_stats():
+    # Cold-start phases and the first-use cost of each lazily imported library
+    return utils.get_import_report()
+
+@app.get("/executor/stats")
+async def executor_stats():
+    # Load and rejections of the CPU and I/O pools
+    return utils.get_executor_stats()
+
 @app.post("/database/reset")
 async def reset_database():
     try:
-        database.reset_database()
+        await utils.run_io(database.reset_database)
         return {"message": "Database reset successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/upload")
-async def upload(file: UploadFile = File(...)):
+async def upload(file: UploadFile = File(...), first_page: Optional[int] = Query(None), last_page: Optional[int] = Query(None)):
+    # first_page/last_page (1-based, inclusive) select a page range of PDFs
     if not file:
         raise HTTPException(status_code=400, detail="No file uploaded")
 
-    suffix = os.path.splitext(file.filename)[1].lower()
-    tmp_dir = tempfile.mkdtemp()
     try:
-        tmp_path = os.path.join(tmp_dir, file.filename)
-        with open(tmp_path, "wb") as f:
-            contents = await file.read()
-            f.write(contents)
-
-        text = await utils.extract_text_from_file(tmp_path)
+        with await uploads.spool_upload(file) as spooled:
+            text = await utils.extract_text_from_file(spooled.path, first_page, last_page, spooled.sha256)
         return {"text": text}
+    except HTTPException:
+        raise
+    except uploads.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except utils.OCRBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        try:
-            shutil.rmtree(tmp_dir)
-        except Exception:
-            pass
 
 class SummarizeRequest(BaseModel):
     text: str
     type: str = "standard"
     length: str = "medium"
+    # Latency budget: return the best summary found within it, flagged complete or not
+    budget_ms: Optional[float] = None
 
 @app.post("/summarize")
 async def summarize(req: SummarizeRequest):
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Missing text to summarize")
+    check_budget(req.budget_ms)
+    deadline = budget_deadline(req.budget_ms)
 
     try:
-        summary = await utils.summarize_text(req.text, req.length)
-        return {"summary": summary}
+        if req.budget_ms is None:
+            summary = await utils.run_summary_task(utils.summarize_text, req.text, req.length)
+            return {"summary": summary}
+        summary, complete = await utils.run_summary_task(utils.summarize_within_budget, req.text, "standard", req.length, deadline, fan_out=False)
+        return {"summary": summary, "complete": complete}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def check_budget(budget_ms: Optional[float]):
+    if budget_ms is not None and budget_ms <= 0:
+        raise HTTPException(status_code=400, detail="budget_ms must be positive")
+
+def budget_deadline(budget_ms: Optional[float]) -> Optional[float]:
+    # Wall-clock time, comparable in the worker process; set on arrival so queueing counts
+    return time.time() + budget_ms / 1000 if budget_ms is not None else None
+
+@app.post("/summarize/stream")
+async def summarize_stream(req: SummarizeRequest, stream_format: str = Query("sse", alias="format")):
+    # Sentences are sent as they are selected; the done event carries the document footer
+    if not req.text or not req.text.strip():
+        raise HTTPException(status_code=400, detail="Missing text to summarize")
+
+    check_stream_format(stream_format)
+    # Submitted before the response starts, so a full queue is a 503, not an error event
+    return stream_events(utils.stream_summary(req.text, "standard", req.length), stream_format)
+
+class AnalyzeRequest(BaseModel):
+    text: str
+    fields: Optional[List[str]] = None
+    # Estimate metrics from a bounded sample of large documents, with confidence intervals
+    approximate: bool = False
+
 @app.post("/analyze")
-async def analyze_document(req: SummarizeRequest):
+async def analyze_document(req: AnalyzeRequest):
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Missing text to analyze")
 
     try:
-        analysis = utils.analyze_document(req.text)
+        analysis = await utils.run_cpu(utils.analyze_document, req.text, fields=req.fields, approximate=req.approximate)
         return analysis
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze-upload")
+async def analyze_upload(file: UploadFile = File(...), fields: Optional[List[str]] = Query(None), approximate: bool = Query(False)):
+    if not file:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    if os.path.splitext(file.filename)[1].lower() != ".txt":
+        raise HTTPException(status_code=400, detail="Streaming analysis supports .txt files only")
+
+    try:
+        # The upload is decoded and scanned chunk by chunk from a memory map, never read whole
+        with await uploads.spool_upload(file) as spooled:
+            analysis = await utils.run_cpu(utils.analyze_text_file, spooled.path, fields, approximate=approximate)
+        return analysis
+    except HTTPException:
+        raise
+    except uploads.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/summarize-upload")
+async def summarize_upload(file: UploadFile = File(...), summary_type: str = Query("standard"), length: str = Query("medium")):
+    if not file:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    if os.path.splitext(file.filename)[1].lower() != ".txt":
+        raise HTTPException(status_code=400, detail="Streaming summaries support .txt files only")
+
+    try:
+        # Ranked from a thread of this process so the file's chunks fan out over the CPU pool
+        with await uploads.spool_upload(file) as spooled:
+            summary = await utils.run_io(utils.call_async, utils.summarize_text_file, spooled.path, summary_type, length)
+        return {"summary": summary, "type": summary_type}
+    except HTTPException:
+        raise
+    except uploads.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/cache/stats")
+async def cache_stats():
+    def collect():
+        return {
+            # Analysis, summaries and PDF extraction run in the CPU workers, so the
+            # in-memory tiers below show only this process's share of the hits
+            "scope": f"In-memory tiers are the API process's; each of the {utils.CPU_WORKERS} CPU workers keeps its own",
+            "analysis": utils.get_analysis_cache_stats(),
+            "word_features": utils.get_word_feature_stats(),
+            "summaries": utils.get_summary_cache_stats(),
+            "pdf_pages": utils.get_pdf_cache_stats(),
+            "extraction": utils.get_extraction_cache_stats()
+        }
+
+    try:
+        return await utils.run_io(collect)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -91,31 +268,109 @@ class AdvancedSummaryRequest(BaseModel):
     text: str
     summary_type: str = "standard"
     length: str = "medium"
+    budget_ms: Optional[float] = None
 
 @app.post("/advanced-summary")
 async def advanced_summary(req: AdvancedSummaryRequest):
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Missing text to summarize")
+    check_budget(req.budget_ms)
+    deadline = budget_deadline(req.budget_ms)
 
     try:
-        if req.summary_type == "bullet_points":
-            summary = await utils.create_bullet_summary(req.text, req.length)
-        elif req.summary_type == "executive":
-            summary = await utils.create_executive_summary(req.text, req.length)
-        elif req.summary_type == "qa":
-            summary = await utils.create_qa_summary(req.text, req.length)
-        elif req.summary_type == "topics":
-            summary = await utils.create_topic_summary(req.text, req.length)
-        elif req.summary_type == "detailed":
-            # For detailed summary, use longer length and more comprehensive format
-            summary = await utils.summarize_text(req.text, "long")
-        else:
-            summary = await utils.summarize_text(req.text, req.length)
+        if req.budget_ms is None:
+            summary = await utils.run_summary_task(utils.create_summary, req.text, req.summary_type, req.length)
+            return {"summary": summary, "type": req.summary_type}
+        summary, complete = await utils.run_summary_task(utils.summarize_within_budget, req.text, req.summary_type, req.length, deadline, fan_out=False)
+        return {"summary": summary, "type": req.summary_type, "complete": complete}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+STREAM_MEDIA_TYPES = {"sse": "text/event-stream", "ndjson": "application/x-ndjson"}
+
+def check_stream_format(stream_format: str):
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format: {stream_format}. Use sse or ndjson")
 
-        return {"summary": summary, "type": req.summary_type}
+def stream_events(events, stream_format: str) -> StreamingResponse:
+    """Send summary events as Server-Sent Events or newline-delimited JSON"""
+    async def encode():
+        try:
+            async for event in events:
+                yield encode_event(event, stream_format)
+        except Exception as e:
+            # Headers are already sent, so the error travels as the last event
+            yield encode_event({"event": "error", "detail": str(e)}, stream_format)
+
+    return StreamingResponse(
+        encode(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def whole_summary_events(text: str, summary_type: str, length: str):
+    """Summary types without a sentence structure are sent whole, between the start and done events"""
+    # Submitted now, like stream_summary, so a full queue raises before the response starts
+    task = utils.submit_summary_task(utils.create_summary_with_word_count, text, summary_type, length)
+    return _whole_summary_events(task, summary_type, length)
+
+async def _whole_summary_events(task, summary_type: str, length: str):
+    yield {"event": "start", "type": summary_type, "length": length, "text": ""}
+    summary, word_count = await task
+    yield {"event": "sentence", "index": 0, "text": summary}
+    yield {"event": "done", "text": "", "word_count": word_count, "sentence_count": 1}
+
+def encode_event(event: dict, stream_format: str) -> str:
+    data = json.dumps(event)
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+@app.post("/advanced-summary/stream")
+async def advanced_summary_stream(req: AdvancedSummaryRequest, stream_format: str = Query("sse", alias="format")):
+    if not req.text or not req.text.strip():
+        raise HTTPException(status_code=400, detail="Missing text to summarize")
+    check_stream_format(stream_format)
+
+    if req.summary_type in ("qa", "topics"):
+        events = whole_summary_events(req.text, req.summary_type, req.length)
+    else:
+        events = utils.stream_summary(req.text, req.summary_type, req.length)
+    return stream_events(events, stream_format)
+
+class SummarySpec(BaseModel):
+    summary_type: str = "standard"
+    length: str = "medium"
+
+class SummaryBundleRequest(BaseModel):
+    text: str
+    summaries: List[SummarySpec]
+
+MAX_BUNDLE_SUMMARIES = 32
+
+@app.post("/summary-bundle")
+async def summary_bundle(req: SummaryBundleRequest):
+    if not req.text or not req.text.strip():
+        raise HTTPException(status_code=400, detail="Missing text to summarize")
+    if not req.summaries:
+        raise HTTPException(status_code=400, detail="No summaries requested")
+    if len(req.summaries) > MAX_BUNDLE_SUMMARIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BUNDLE_SUMMARIES} summaries per bundle")
+
+    try:
+        # Every summary in the bundle selects its sentences from one scoring pass, in one pool task
+        specs = [(spec.summary_type, spec.length) for spec in req.summaries]
+        results, word_count = await utils.run_summary_task(utils.create_summary_bundle, req.text, specs)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    return {"summaries": results, "word_count": word_count, "successful": sum(1 for r in results if r["success"])}
+
 class ExportRequest(BaseModel):
     content: str
     format: str
@@ -127,15 +382,16 @@ async def export_document(req: ExportRequest):
         raise HTTPException(status_code=400, detail="Missing content to export")
 
     try:
+        # PDF and DOCX rendering runs in the CPU pool; Markdown and text are plain formatting, done inline
         if req.format.lower() == "pdf":
-            content = utils.export_to_pdf(req.content, req.title)
+            content = await utils.run_cpu(utils.export_to_pdf, req.content, req.title)
             return Response(
                 content=content,
                 media_type="application/pdf",
                 headers={"Content-Disposition": f"attachment; filename={req.title}.pdf"}
             )
         elif req.format.lower() == "docx":
-            content = utils.export_to_docx(req.content, req.title)
+            content = await utils.run_cpu(utils.export_to_docx, req.content, req.title)
             return Response(
                 content=content,
                 media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -158,6 +414,8 @@ async def export_document(req: ExportRequest):
         else:
             raise HTTPException(status_code=400, detail="Unsupported export format. Use: pdf, docx, markdown, or txt")
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -167,27 +425,26 @@ async def batch_upload(files: List[UploadFile] = File(...)):
         raise HTTPException(status_code=400, detail="No files provided")
 
     results = []
+    extracted = []
 
     for file in files:
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp_file:
-                shutil.copyfileobj(file.file, tmp_file)
-                tmp_path = tmp_file.name
-
-            text = await utils.extract_text_from_file(tmp_path)
-
-            os.unlink(tmp_path)
-
-            analysis = utils.analyze_document(text) if text else None
+            with await uploads.spool_upload(file) as spooled:
+                text = await utils.extract_text_from_file(spooled.path, file_sha256=spooled.sha256)
 
             results.append({
                 "filename": file.filename,
                 "success": True,
                 "text": text,
                 "word_count": len(text.split()) if text else 0,
-                "analysis": analysis
+                "analysis": None
             })
+            if text:
+                extracted.append((results[-1], text))
 
+        except HTTPException:
+            # Overloaded pools refuse the whole batch with 503 and Retry-After
+            raise
         except Exception as e:
             results.append({
                 "filename": file.filename,
@@ -195,9 +452,15 @@ async def batch_upload(files: List[UploadFile] = File(...)):
                 "error": str(e)
             })
 
-        finally:
-            if 'tmp_path' in locals() and os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+    # Analyze all extracted texts together in one vectorized batch
+    try:
+        analyses = await utils.run_cpu(utils.analyze_documents, [text for _, text in extracted])
+    except HTTPException:
+        raise
+    except Exception as e:
+        analyses = [{"error": str(e)}] * len(extracted)
+    for (result, _), analysis in zip(extracted, analyses):
+        result["analysis"] = analysis
 
     return {"results": results, "total_files": len(files), "successful": sum(1 for r in results if r["success"])}
 
@@ -212,19 +475,12 @@ async def batch_summarize(req: BatchSummaryRequest):
         raise HTTPException(status_code=400, detail="No texts provided")
 
     results = []
+    # Batch summaries have no detailed variant; like any unknown type it gets the standard summary
+    summary_type = "standard" if req.summary_type == "detailed" else req.summary_type
 
     for i, text in enumerate(req.texts):
         try:
-            if req.summary_type == "bullet_points":
-                summary = await utils.create_bullet_summary(text, req.length)
-            elif req.summary_type == "executive":
-                summary = await utils.create_executive_summary(text, req.length)
-            elif req.summary_type == "qa":
-                summary = await utils.create_qa_summary(text, req.length)
-            elif req.summary_type == "topics":
-                summary = await utils.create_topic_summary(text, req.length)
-            else:
-                summary = await utils.summarize_text(text, req.length)
+            summary = await utils.run_summary_task(utils.create_summary, text, summary_type, req.length)
 
             results.append({
                 "index": i,
@@ -260,7 +516,8 @@ async def save_document_to_history(req: SaveDocumentRequest):
         print(f"Summary length: {len(req.summary) if req.summary else 0}")
         print(f"Analysis present: {req.analysis is not None}")
         
-        document_id = database.save_document(
+        document_id = await utils.run_io(
+            database.save_document,
             filename=req.filename,
             text=req.text,
             summary=req.summary,
@@ -272,6 +529,8 @@ async def save_document_to_history(req: SaveDocumentRequest):
 
         print(f"Document saved with ID: {document_id}")
         return {"document_id": document_id, "message": "Document saved successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error saving document: {str(e)}")
         import traceback
@@ -281,19 +540,21 @@ async def save_document_to_history(req: SaveDocumentRequest):
 @app.get("/documents")
 async def get_documents(limit: int = 50, offset: int = 0):
     try:
-        documents = database.get_all_documents(limit, offset)
+        documents = await utils.run_io(database.get_all_documents, limit, offset)
         return {"documents": documents}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/documents/{document_id}")
 async def get_document_by_id(document_id: int):
     try:
-        document = database.get_document(document_id)
+        document = await utils.run_io(database.get_document, document_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        document["tags"] = database.get_document_tags(document_id)
+        document["tags"] = await utils.run_io(database.get_document_tags, document_id)
 
         return {"document": document}
     except HTTPException:
@@ -304,19 +565,21 @@ async def get_document_by_id(document_id: int):
 @app.get("/documents/search/{query}")
 async def search_documents(query: str, limit: int = 20):
     try:
-        results = database.search_documents(query, limit)
+        results = await utils.run_io(database.search_documents, query, limit)
         return {"results": results, "query": query}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/documents/{document_id}")
 async def delete_document(document_id: int):
     try:
-        document = database.get_document(document_id)
+        document = await utils.run_io(database.get_document, document_id)
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        database.delete_document(document_id)
+        await utils.run_io(database.delete_document, document_id)
         return {"message": "Document deleted successfully"}
     except HTTPException:
         raise
@@ -327,9 +590,11 @@ async def delete_document(document_id: int):
 async def get_document_stats():
     try:
         print("Fetching document stats...")
-        stats = database.get_document_stats()
+        stats = await utils.run_io(database.get_document_stats)
         print(f"Stats retrieved: {stats}")
         return {"stats": stats}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error getting stats: {str(e)}")
         import traceback
@@ -343,8 +608,10 @@ class DocumentTagRequest(BaseModel):
 async def add_document_tags(document_id: int, req: DocumentTagRequest):
     try:
         for tag in req.tags:
-            database.add_document_tag(document_id, tag)
+            await utils.run_io(database.add_document_tag, document_id, tag)
         return {"message": "Tags added successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -363,10 +630,10 @@ async def summarize_local(req: SummarizeRequest):
 @app.post("/summarize-fast")
 async def summarize_fast(req: SummarizeRequest):
     try:
-        summary = utils.create_extractive_summary(req.text, req.length)
+        summary = await utils.run_summary_task(utils.create_extractive_summary, req.text, req.length)
         return {"summary": summary}
     except Exception as e:
-        # Simple fallback
+        # Simple fallback, also when the CPU pool is full
         words = req.text.split()
         if len(words) < 50:
             fallback = req.text
@@ -386,6 +653,8 @@ async def advanced_summary_local(req: AdvancedSummaryRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Advanced local summarization failed: {str(e)}")
 
+utils.record_startup("app_import", IMPORT_STARTED)
+
 if __name__ == "__main__":
     import uvicorn
 
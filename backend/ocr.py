@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List
+
+from executor import IO_WORKERS
+from lazy_imports import load_module, module_available
+
+# Pillow and pytesseract are imported on the first OCR request, not at startup
+TESSERACT_AVAILABLE = module_available("pytesseract")
+
+# Each worker thread drives one Tesseract process, so this bounds concurrent OCR processes
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", min(4, os.cpu_count() or 1)))
+# Files being OCRed at once; further uploads are refused with OCRBusy instead of piling up.
+# Each waits on a shared I/O thread, so half of those stay free for SQLite and file reads
+OCR_MAX_PENDING_FILES = int(os.environ.get("OCR_MAX_PENDING_FILES", max(1, IO_WORKERS // 2)))
+# Pages of one file decoded and queued ahead of the workers
+OCR_PAGES_IN_FLIGHT = int(os.environ.get("OCR_PAGES_IN_FLIGHT", 2 * OCR_WORKERS))
+# Images scanned at a higher resolution are downscaled to this; Tesseract gains nothing above it
+OCR_TARGET_DPI = int(os.environ.get("OCR_TARGET_DPI", 300))
+OCR_PAGE_TIMEOUT = float(os.environ.get("OCR_PAGE_TIMEOUT", 120))
+OCR_RECENT_PAGES = 100
+
+_pool = None
+_pool_lock = threading.Lock()
+_admission = threading.BoundedSemaphore(OCR_MAX_PENDING_FILES)
+_stats_lock = threading.Lock()
+_stats = {"files": 0, "pages": 0, "rejected": 0, "preprocess_ms": 0.0, "ocr_ms": 0.0}
+_recent_pages = deque(maxlen=OCR_RECENT_PAGES)
+
+class OCRBusy(Exception):
+    pass
+
+def ocr_file(file_path: str) -> str:
+    """Text of an image file; the pages of a multi-page TIFF are OCRed in parallel.
+
+    Frames are decoded one at a time and at most OCR_PAGES_IN_FLIGHT of them
+    wait for the shared worker pool, so memory stays bounded for long scans.
+    Raises OCRBusy when OCR_MAX_PENDING_FILES files are already in progress.
+    """
+    if not _admission.acquire(blocking=False):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise OCRBusy(f"OCR queue is full ({OCR_MAX_PENDING_FILES} files in progress), try again later")
+    try:
+        return _ocr_frames(file_path)
+    finally:
+        _admission.release()
+
+def _ocr_frames(file_path: str) -> str:
+    pool = _get_pool()
+    with _image_module().open(file_path) as image:
+        frame_count = getattr(image, "n_frames", 1)
+        texts = [None] * frame_count
+        pending = deque()
+        for index in range(frame_count):
+            image.seek(index)
+            # Workers get their own copy; the decoder is not safe to share between threads
+            pending.append((index, pool.submit(_ocr_page, image.copy(), index + 1)))
+            if len(pending) >= OCR_PAGES_IN_FLIGHT:
+                done, future = pending.popleft()
+                texts[done] = future.result()
+        while pending:
+            done, future = pending.popleft()
+            texts[done] = future.result()
+
+    with _stats_lock:
+        _stats["files"] += 1
+    return "\n".join(texts).strip()
+
+def _ocr_page(image, page: int) -> str:
+    started = time.perf_counter()
+    prepared = preprocess_image(image)
+    preprocessed = time.perf_counter()
+    text = _tesseract().image_to_string(prepared, timeout=OCR_PAGE_TIMEOUT)
+    finished = time.perf_counter()
+
+    timing = {
+        "page": page,
+        "width": prepared.width,
+        "height": prepared.height,
+        "preprocess_ms": round((preprocessed - started) * 1000, 1),
+        "ocr_ms": round((finished - preprocessed) * 1000, 1),
+    }
+    with _stats_lock:
+        _stats["pages"] += 1
+        _stats["preprocess_ms"] += timing["preprocess_ms"]
+        _stats["ocr_ms"] += timing["ocr_ms"]
+        _recent_pages.append(timing)
+    return text
+
+def preprocess_image(image):
+    """Downscale to OCR_TARGET_DPI, convert to grayscale and binarize with Otsu's threshold"""
+    dpi = _image_dpi(image)
+    if dpi and dpi > OCR_TARGET_DPI:
+        scale = OCR_TARGET_DPI / dpi
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, _image_module().LANCZOS)
+    gray = image.convert("L")
+    threshold = _otsu_threshold(gray.histogram())
+    return gray.point([0 if value <= threshold else 255 for value in range(256)])
+
+def _image_dpi(image) -> float:
+    dpi = image.info.get("dpi")
+    try:
+        return float(dpi[0] if isinstance(dpi, tuple) else dpi)
+    except (TypeError, ValueError, IndexError):
+        return 0.0
+
+def _otsu_threshold(histogram: List[int]) -> int:
+    """Gray level that best separates dark (text) from light (paper) pixels"""
+    total = sum(histogram)
+    if not total:
+        return 127
+    level_sum = sum(level * count for level, count in enumerate(histogram))
+    background_count = 0
+    background_sum = 0
+    best_level, best_variance = 127, -1.0
+    for level, count in enumerate(histogram):
+        background_count += count
+        if not background_count:
+            continue
+        foreground_count = total - background_count
+        if not foreground_count:
+            break
+        background_sum += level * count
+        background_mean = background_sum / background_count
+        foreground_mean = (level_sum - background_sum) / foreground_count
+        variance = background_count * foreground_count * (background_mean - foreground_mean) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+def _image_module():
+    return load_module("PIL.Image")
+
+@lru_cache(maxsize=1)
+def _tesseract():
+    pytesseract = load_module("pytesseract")
+    if os.name == 'nt':
+        tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+        if os.path.exists(tesseract_path):
+            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+    return pytesseract
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix="ocr")
+        return _pool
+
+def get_ocr_stats() -> Dict:
+    with _stats_lock:
+        stats = dict(_stats)
+        recent = list(_recent_pages)
+    pages = stats["pages"]
+    stats.update(
+        workers=OCR_WORKERS,
+        max_pending_files=OCR_MAX_PENDING_FILES,
+        average_preprocess_ms=round(stats["preprocess_ms"] / pages, 1) if pages else 0.0,
+        average_ocr_ms=round(stats["ocr_ms"] / pages, 1) if pages else 0.0,
+        recent_pages=recent,
+    )
+    return stats
+
+def shutdown_ocr_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from cache import LRUCache, file_hash
+from executor import CPU_WORKERS, cpu_pool, reset_cpu_pool
+from lazy_imports import load_module
+
+PDF_PAGE_CACHE_SIZE = int(os.environ.get("PDF_PAGE_CACHE_SIZE", 4096))
+# Fewer uncached pages than this are extracted in-process; the pool costs more than it saves
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 16))
+
+_page_cache = LRUCache(PDF_PAGE_CACHE_SIZE)
+
+def extract_pdf_pages(file_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None,
+                      file_sha256: Optional[str] = None) -> List[str]:
+    """Text of pages first_page..last_page (1-based, inclusive; default all pages).
+
+    Pages are cached by file hash and page number, so re-uploads and overlapping
+    ranges only extract the pages not seen before. Those are split into
+    contiguous runs extracted in parallel by the CPU process pool, each worker
+    opening the file itself so no parsed PDF objects cross processes.
+    """
+    page_count = len(_pdf_reader(file_path).pages)
+    first = 1 if first_page is None else first_page
+    last = page_count if last_page is None else last_page
+    if not 1 <= first <= last <= page_count:
+        raise ValueError(f"Invalid page range {first}-{last} for a {page_count}-page PDF")
+
+    digest = file_sha256 or file_hash(file_path)
+    texts = {page: _page_cache.get(f"{digest}:{page}") for page in range(first, last + 1)}
+    missing = [page for page, text in texts.items() if text is None]
+    if missing:
+        for page, text in _extract_pages(file_path, missing).items():
+            _page_cache.put(f"{digest}:{page}", text)
+            texts[page] = text
+    return [texts[page] for page in range(first, last + 1)]
+
+def extract_pdf_text(file_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None,
+                     file_sha256: Optional[str] = None) -> str:
+    return "\n".join(extract_pdf_pages(file_path, first_page, last_page, file_sha256)).strip()
+
+def _extract_pages(file_path: str, pages: List[int]) -> Dict[int, str]:
+    pool = cpu_pool()
+    if pool is not None and CPU_WORKERS > 1 and len(pages) >= PDF_PARALLEL_MIN_PAGES:
+        # A few runs per worker balance uneven pages without reopening the file for every page
+        run_length = -(-len(pages) // (CPU_WORKERS * 4))
+        runs = [pages[i:i + run_length] for i in range(0, len(pages), run_length)]
+        try:
+            texts = {}
+            for result in pool.map(_extract_page_run, [file_path] * len(runs), runs):
+                texts.update(result)
+            return texts
+        except (BrokenProcessPool, OSError) as e:
+            print(f"PDF process pool unavailable, extracting pages in-process: {str(e)}")
+            reset_cpu_pool()
+    return _extract_page_run(file_path, pages)
+
+def _extract_page_run(file_path: str, pages: List[int]) -> Dict[int, str]:
+    reader = _pdf_reader(file_path)
+    # extract_text() returns None for pages without a text layer
+    return {page: reader.pages[page - 1].extract_text() or "" for page in pages}
+
+def _pdf_reader(file_path: str):
+    # PyPDF2 is imported on the first PDF, not at startup
+    return load_module("PyPDF2").PdfReader(file_path)
+
+def get_pdf_cache_stats() -> Dict:
+    return _page_cache.stats()
@@ -0,0 +1,259 @@
+import math
+import os
+import random
+from collections import Counter
+from typing import List, Optional
+
+from cache import normalize_text
+from scanner import TextScan, SAFE_CUT_PATTERN, SAFE_CUT_WINDOW, _SegmentStats
+
+# Approximate analysis scans at most SAMPLE_BLOCKS blocks of about BLOCK_SIZE characters
+APPROXIMATE_SAMPLE_BLOCKS = int(os.environ.get("APPROXIMATE_SAMPLE_BLOCKS", 64))
+APPROXIMATE_BLOCK_SIZE = int(os.environ.get("APPROXIMATE_BLOCK_SIZE", 4096))
+
+def _cut_after(text: str, position: int) -> int:
+    """First safe cut point at or after position (or position itself if none is near)"""
+    if position <= 0 or position >= len(text):
+        return max(0, min(position, len(text)))
+    match = SAFE_CUT_PATTERN.search(text, position - 1, position + SAFE_CUT_WINDOW)
+    return match.end() if match else position
+
+def sample_text_blocks(text: str, max_blocks: int = APPROXIMATE_SAMPLE_BLOCKS,
+                       block_size: int = APPROXIMATE_BLOCK_SIZE, seed: Optional[int] = None) -> List[str]:
+    """Uniform sample of blocks from a partition of text into safe-cut-aligned blocks.
+
+    Only the sampled block offsets are drawn, so the cost depends on the sample
+    size and not on the length of the text. Blocks are returned in text order.
+    """
+    n_blocks = max(1, math.ceil(len(text) / block_size))
+    rng = random.Random(len(text) if seed is None else seed)
+    indices = sorted(rng.sample(range(n_blocks), min(max_blocks, n_blocks)))
+    return [text[_cut_after(text, i * block_size):_cut_after(text, (i + 1) * block_size)] for i in indices]
+
+class BlockReservoir:
+    """Reservoir sample (Algorithm R) of safe-cut-aligned blocks from a chunk stream"""
+
+    def __init__(self, max_blocks: int = APPROXIMATE_SAMPLE_BLOCKS,
+                 block_size: int = APPROXIMATE_BLOCK_SIZE, seed: Optional[int] = None):
+        self.max_blocks = max_blocks
+        self.block_size = block_size
+        self.blocks = []
+        self.block_count = 0
+        self.total_chars = 0
+        self._buffer = ""
+        self._rng = random.Random(seed)
+
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        self.total_chars += len(chunk)
+        self._buffer += chunk
+        while len(self._buffer) > self.block_size:
+            cut = _cut_after(self._buffer, self.block_size)
+            if cut >= len(self._buffer):
+                return
+            self._offer(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+
+    def finish(self) -> List[str]:
+        if self._buffer:
+            self._offer(self._buffer)
+            self._buffer = ""
+        return self.blocks
+
+    def _offer(self, block: str):
+        if len(self.blocks) < self.max_blocks:
+            self.blocks.append(block)
+        else:
+            j = self._rng.randrange(self.block_count + 1)
+            if j < self.max_blocks:
+                self.blocks[j] = block
+        self.block_count += 1
+
+# Block counters read straight from the block's TextScan
+_SCAN_FIELDS = (
+    "char_count", "space_count", "punctuation_count", "upper_count", "alpha_count", "digit_count",
+    "word_count", "word_length_total", "long_word_count", "alpha_word_count", "syllable_count",
+    "positive_word_count", "negative_word_count",
+)
+
+# Per-block counters that scale linearly with the amount of text
+_ADDITIVE_FIELDS = _SCAN_FIELDS + (
+    "header_count", "bullet_count", "numbered_list_count",
+    "question_count", "sentence_ends", "sentence_runs", "sentence_words", "sentence_squares",
+    "short_sentences", "long_sentences", "paragraph_ends", "paragraph_runs", "paragraph_words",
+)
+
+class SampledScan:
+    """Whole-document counter estimates from a sample of text blocks.
+
+    Each block is scanned on its own. Additive counters are summed and scaled by
+    total_chars / sampled characters. Sentences and paragraphs are counted by the
+    block their end falls in, and their length statistics come from the ones that
+    lie entirely inside a block.
+    Vocabulary sizes grow sublinearly, so they are extrapolated with Heaps' law
+    fitted on the sample. scan(exclude=i) gives the leave-one-out estimate used
+    for jackknife confidence intervals.
+    """
+
+    def __init__(self, blocks: List[str], total_chars: int, population_blocks: int):
+        self.total_chars = total_chars
+        self.population_blocks = max(population_blocks, len(blocks))
+        self.blocks = [self._scan_block(block) for block in blocks]
+        self.sampled_chars = sum(block["char_count"] for block in self.blocks)
+        self.totals = {name: sum(block[name] for block in self.blocks) for name in _ADDITIVE_FIELDS}
+
+        # Number of sampled blocks each word occurs in, for leave-one-out vocabulary sizes
+        self.vocabulary = Counter()
+        self.alpha_vocabulary = Counter()
+        for block in self.blocks:
+            self.vocabulary.update(block["vocabulary"])
+            self.alpha_vocabulary.update(block["alpha_vocabulary"])
+        self.vocabulary_growth = self._heaps_exponent("vocabulary", "word_count")
+        self.alpha_vocabulary_growth = self._heaps_exponent("alpha_vocabulary", "alpha_word_count")
+
+        self.paragraph_min = min((b["paragraph_min"] for b in self.blocks if b["paragraph_runs"]), default=0)
+        self.paragraph_max = max((b["paragraph_max"] for b in self.blocks if b["paragraph_runs"]), default=0)
+
+    @property
+    def sample_fraction(self) -> float:
+        return self.sampled_chars / self.total_chars if self.total_chars else 1.0
+
+    @staticmethod
+    def _scan_block(text: str) -> dict:
+        stats = _SegmentStats()
+        stats.add(text)
+        scan = TextScan.from_counts(
+            char_counts=stats.char_counts,
+            char_count=stats.char_count,
+            space_count=stats.char_counts[' '],
+            word_type_counts=stats.word_type_counts,
+            phrase_sentiment=(stats.phrases.positive, stats.phrases.negative),
+        )
+        lower_counts = scan.lower_word_counts
+        sentences, paragraphs = stats.sentences, stats.paragraphs
+
+        block = {name: getattr(scan, name) for name in _SCAN_FIELDS}
+        block.update(
+            header_count=stats.header_count,
+            bullet_count=stats.bullet_count,
+            numbered_list_count=stats.numbered_list_count,
+            question_count=stats.question_count,
+            sentence_ends=_run_ends(sentences),
+            sentence_runs=sentences.count,
+            sentence_words=sentences.total,
+            sentence_squares=sentences.squares,
+            short_sentences=sentences.short,
+            long_sentences=sentences.long,
+            paragraph_ends=_run_ends(paragraphs),
+            paragraph_runs=paragraphs.count,
+            paragraph_words=paragraphs.total,
+            paragraph_min=paragraphs.minimum,
+            paragraph_max=paragraphs.maximum,
+            vocabulary=list(lower_counts),
+            alpha_vocabulary=[word for word in lower_counts if word.isalpha()],
+            keyword_counts=scan.keyword_counts,
+        )
+        return block
+
+    def _heaps_exponent(self, vocabulary: str, words: str) -> float:
+        """Vocabulary growth exponent, from the first half of the sample versus all of it"""
+        half = self.blocks[:len(self.blocks) // 2]
+        half_words = sum(block[words] for block in half)
+        all_words = self.totals[words]
+        half_vocabulary = len(set().union(*(block[vocabulary] for block in half)))
+        if not half_words or not half_vocabulary or all_words <= half_words:
+            return 1.0
+        exponent = math.log(len(getattr(self, vocabulary)) / half_vocabulary) / math.log(all_words / half_words)
+        return max(0.0, min(1.0, exponent))
+
+    def _vocabulary_size(self, vocabulary: str, exclude: Optional[int]) -> int:
+        size = len(getattr(self, vocabulary))
+        if exclude is not None:
+            counts = getattr(self, vocabulary)
+            size -= sum(1 for word in self.blocks[exclude][vocabulary] if counts[word] == 1)
+        return size
+
+    def scan(self, exclude: Optional[int] = None, keywords: bool = True) -> TextScan:
+        """Scaled whole-document counters, optionally leaving one block out"""
+        totals = dict(self.totals)
+        sampled_chars = self.sampled_chars
+        if exclude is not None:
+            block = self.blocks[exclude]
+            for name in _ADDITIVE_FIELDS:
+                totals[name] -= block[name]
+            sampled_chars -= block["char_count"]
+        scale = self.total_chars / sampled_chars if sampled_chars else 0.0
+
+        fields = {name: round(totals[name] * scale) for name in _ADDITIVE_FIELDS}
+        fields["char_count"] = self.total_chars
+        word_count = fields["word_count"]
+
+        fields.update(self._scaled_sentences(totals, scale, word_count))
+        fields.update(self._scaled_paragraphs(totals, scale, word_count))
+
+        # Vocabulary grows as words ** exponent (Heaps' law), and can never exceed the word count
+        for name, vocabulary, words, growth in (
+            ("unique_word_count", "vocabulary", "word_count", self.vocabulary_growth),
+            ("unique_alpha_word_count", "alpha_vocabulary", "alpha_word_count", self.alpha_vocabulary_growth),
+        ):
+            sampled = self._vocabulary_size(vocabulary, exclude)
+            growth_factor = (fields[words] / totals[words]) ** growth if totals[words] else 0
+            fields[name] = min(fields[words], round(sampled * growth_factor))
+
+        if keywords:
+            keyword_counts = Counter()
+            for i, block in enumerate(self.blocks):
+                if i != exclude:
+                    keyword_counts.update(block["keyword_counts"])
+            fields["keyword_counts"] = keyword_counts
+
+        return TextScan.from_counts(**fields)
+
+    def _scaled_sentences(self, totals: dict, scale: float, word_count: int) -> dict:
+        count = round(totals["sentence_ends"] * scale)
+        runs = totals["sentence_runs"]
+        if not runs:
+            # No whole sentence inside the sample: treat the document as one long sentence
+            return {
+                "sentence_count": 1 if word_count else 0,
+                "sentence_length_total": word_count,
+                "sentence_length_squares": word_count * word_count,
+                "short_sentence_count": 1 if 0 < word_count < 10 else 0,
+                "long_sentence_count": 1 if word_count > 20 else 0,
+                "question_count": 0,
+            }
+        # Per-sentence averages from whole sentences, times the estimated number of sentences
+        return {
+            "sentence_count": count,
+            "sentence_length_total": round(totals["sentence_words"] * count / runs),
+            "sentence_length_squares": round(totals["sentence_squares"] * count / runs),
+            "short_sentence_count": round(totals["short_sentences"] * count / runs),
+            "long_sentence_count": round(totals["long_sentences"] * count / runs),
+            "question_count": round(totals["question_count"] * count / runs),
+        }
+
+    def _scaled_paragraphs(self, totals: dict, scale: float, word_count: int) -> dict:
+        count = round(totals["paragraph_ends"] * scale)
+        if not totals["paragraph_runs"] or not count:
+            return {
+                "paragraph_count": 1 if word_count else 0,
+                "paragraph_length_total": word_count,
+                "paragraph_length_min": word_count,
+                "paragraph_length_max": word_count,
+            }
+        return {
+            "paragraph_count": count,
+            "paragraph_length_total": word_count,
+            "paragraph_length_min": self.paragraph_min,
+            "paragraph_length_max": self.paragraph_max,
+        }
+
+def _run_ends(runs) -> int:
+    """Runs that end inside a segment: the inner ones plus the lead if a delimiter closes it"""
+    return runs.count + (1 if runs.split and runs.lead else 0)
+
+def sample_text(text: str, max_blocks: int = APPROXIMATE_SAMPLE_BLOCKS,
+                block_size: int = APPROXIMATE_BLOCK_SIZE) -> SampledScan:
+    blocks = [normalize_text(block) for block in sample_text_blocks(text, max_blocks, block_size)]
+    return SampledScan(blocks, len(text), math.ceil(len(text) / block_size))
@@ -0,0 +1,423 @@
+import re
+from collections import Counter
+from typing import Iterable, List
+
+from lexicon import PhraseCounter, count_phrases, get_lexicon
+from word_features import get_word_features
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+KEYWORD_TOKEN_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+HEADER_PATTERN = re.compile(r'\n[A-Z][A-Z\s]*:\s*')
+BULLET_PATTERN = re.compile(r'[•\-\*]\s+')
+NUMBERED_LIST_PATTERN = re.compile(r'\d+\.\s+')
+
+PUNCTUATION_CHARS = '.,;:!?'
+
+# A position right after whitespace and before a character that is neither whitespace,
+# an uppercase letter nor a colon. No token, sentence or paragraph delimiter and no
+# structure-regex match can span such a position, so text can be cut there and the
+# pieces scanned independently.
+SAFE_CUT_PATTERN = re.compile(r'\s(?=[^\sA-Z:])')
+SAFE_CUT_WINDOW = 4096
+
+class TextScan:
+    """Tokens, sentences, paragraphs and counters for one document, computed on demand.
+
+    Every metric in analyzer.py reads from this structure instead of re-tokenizing
+    the text. Each group of fields is produced by one scan the first time any of
+    them is read and then shared, so a report that needs only a few sections never
+    pays for the others. Word-level counters are aggregated per distinct token, so
+    their cost scales with vocabulary size rather than document length.
+    """
+
+    # Field name -> scan method that computes it (together with the rest of its group)
+    _LAZY_FIELDS = {
+        'words': '_split_words',
+        'sentences': '_split_sentences',
+        'paragraphs': '_split_paragraphs',
+        'char_counts': '_count_characters',
+        'char_count': '_scan_length',
+        'space_count': '_scan_length',
+        'punctuation_count': '_scan_characters',
+        'upper_count': '_scan_characters',
+        'alpha_count': '_scan_characters',
+        'digit_count': '_scan_characters',
+        'word_type_counts': '_count_words',
+        'lower_word_counts': '_scan_words',
+        'word_count': '_scan_words',
+        'word_length_total': '_scan_words',
+        'long_word_count': '_scan_words',
+        'alpha_word_count': '_scan_words',
+        'unique_word_count': '_scan_words',
+        'unique_alpha_word_count': '_scan_words',
+        'syllable_count': '_scan_syllables',
+        'keyword_counts': '_scan_keywords',
+        'phrase_sentiment': '_scan_phrases',
+        'positive_word_count': '_scan_sentiment',
+        'negative_word_count': '_scan_sentiment',
+        'sentence_count': '_scan_sentences',
+        'sentence_length_total': '_scan_sentences',
+        'sentence_length_squares': '_scan_sentences',
+        'short_sentence_count': '_scan_sentences',
+        'long_sentence_count': '_scan_sentences',
+        'question_count': '_scan_sentences',
+        'paragraph_count': '_scan_paragraphs',
+        'paragraph_length_total': '_scan_paragraphs',
+        'paragraph_length_min': '_scan_paragraphs',
+        'paragraph_length_max': '_scan_paragraphs',
+        'header_count': '_scan_structure',
+        'bullet_count': '_scan_structure',
+        'numbered_list_count': '_scan_structure',
+    }
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __getattr__(self, name: str):
+        method = TextScan._LAZY_FIELDS.get(name)
+        if method is None:
+            raise AttributeError(f"'TextScan' object has no attribute '{name}'")
+        getattr(self, method)()
+        return self.__dict__[name]
+
+    # Shared token / sentence / paragraph structure
+
+    def _split_words(self):
+        self.words = self.text.split()
+
+    def _split_sentences(self):
+        self.sentences = [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(self.text) if s.strip()]
+
+    def _split_paragraphs(self):
+        self.paragraphs = [p.strip() for p in self.text.split('\n\n') if p.strip()]
+
+    # Counters
+
+    def _scan_length(self):
+        self.char_count = len(self.text)
+        self.space_count = self.text.count(' ')
+
+    def _count_characters(self):
+        self.char_counts = Counter(self.text)
+
+    def _scan_characters(self):
+        char_counts = self.char_counts
+
+        self.punctuation_count = sum(char_counts[c] for c in PUNCTUATION_CHARS)
+        self.upper_count = 0
+        self.alpha_count = 0
+        self.digit_count = 0
+        for char, n in char_counts.items():
+            if char.isupper():
+                self.upper_count += n
+            if char.isalpha():
+                self.alpha_count += n
+            if char.isdigit():
+                self.digit_count += n
+
+    def _count_words(self):
+        # Counter keeps first-occurrence order, which keyword ranking relies on for ties
+        self.word_type_counts = Counter(self.words)
+
+    def _scan_words(self):
+        word_counts = self.word_type_counts
+        lower_counts = Counter()
+        alpha_types = set()
+
+        word_count = 0
+        word_length_total = 0
+        long_word_count = 0
+        alpha_word_count = 0
+
+        for word, n in word_counts.items():
+            features = get_word_features(word)
+            word_count += n
+            word_length_total += features.length * n
+            if features.length > 6:
+                long_word_count += n
+            if features.is_alpha:
+                alpha_word_count += n
+                alpha_types.add(features.lower)
+            lower_counts[features.lower] += n
+
+        self.lower_word_counts = lower_counts
+        self.word_count = word_count
+        self.word_length_total = word_length_total
+        self.long_word_count = long_word_count
+        self.alpha_word_count = alpha_word_count
+        self.unique_word_count = len(lower_counts)
+        self.unique_alpha_word_count = len(alpha_types)
+
+    def _scan_syllables(self):
+        # Syllables come from the shared per-word feature table, so this scales with vocabulary size
+        self.syllable_count = sum(get_word_features(word).syllables * n for word, n in self.word_type_counts.items())
+
+    def _scan_keywords(self):
+        keyword_counts = Counter()
+        for lower, n in self.lower_word_counts.items():
+            for token in KEYWORD_TOKEN_PATTERN.findall(lower):
+                keyword_counts[token] += n
+
+        self.keyword_counts = keyword_counts
+
+    def _scan_phrases(self):
+        # Multi-word phrases need token order, so this only walks the tokens when one can match
+        lexicon = get_lexicon()
+        if lexicon.may_match_phrases(self.lower_word_counts):
+            self.phrase_sentiment = count_phrases(lexicon, self.text.lower().split())
+        else:
+            self.phrase_sentiment = (0, 0)
+
+    def _scan_sentiment(self):
+        positive, negative = get_lexicon().count_words(self.lower_word_counts)
+        phrase_positive, phrase_negative = self.phrase_sentiment
+        self.positive_word_count = positive + phrase_positive
+        self.negative_word_count = negative + phrase_negative
+
+    def _scan_sentences(self):
+        lengths = [len(s.split()) for s in self.sentences]
+
+        self.sentence_count = len(lengths)
+        self.sentence_length_total = sum(lengths)
+        self.sentence_length_squares = sum(n * n for n in lengths)
+        self.short_sentence_count = sum(1 for n in lengths if n < 10)
+        self.long_sentence_count = sum(1 for n in lengths if n > 20)
+        self.question_count = sum(1 for s in self.sentences if s.endswith('?'))
+
+    def _scan_paragraphs(self):
+        lengths = [len(p.split()) for p in self.paragraphs]
+
+        self.paragraph_count = len(lengths)
+        self.paragraph_length_total = sum(lengths)
+        self.paragraph_length_min = min(lengths) if lengths else 0
+        self.paragraph_length_max = max(lengths) if lengths else 0
+
+    def _scan_structure(self):
+        self.header_count = len(HEADER_PATTERN.findall(self.text))
+        self.bullet_count = len(BULLET_PATTERN.findall(self.text))
+        self.numbered_list_count = len(NUMBERED_LIST_PATTERN.findall(self.text))
+
+    @classmethod
+    def from_counts(cls, **fields) -> 'TextScan':
+        """Build a scan from precomputed counters (no text); unset fields are derived lazily"""
+        scan = cls.__new__(cls)
+        scan.__dict__.update(fields)
+        return scan
+
+def scan_text(text: str) -> TextScan:
+    return TextScan(text)
+
+class _RunStats:
+    """Word-count statistics of delimiter-separated runs (sentences or paragraphs).
+
+    Runs can straddle segment boundaries, so the run before the first delimiter
+    (lead) and the one after the last delimiter (trail) are kept open until the
+    neighbouring segment is known.
+    """
+
+    def __init__(self):
+        self.lead = 0
+        self.split = False
+        self.trail = 0
+        self.count = 0
+        self.total = 0
+        self.squares = 0
+        self.minimum = 0
+        self.maximum = 0
+        self.short = 0
+        self.long = 0
+
+    def _close(self, n: int):
+        # A run without words is whitespace only and is not counted
+        if n == 0:
+            return
+        self.minimum = n if self.count == 0 else min(self.minimum, n)
+        self.maximum = max(self.maximum, n)
+        self.count += 1
+        self.total += n
+        self.squares += n * n
+        if n < 10:
+            self.short += 1
+        if n > 20:
+            self.long += 1
+
+    def extend(self, lengths: List[int]):
+        """Append the word counts of the pieces one segment splits into"""
+        first = lengths[0]
+        if self.split:
+            self.trail += first
+        else:
+            self.lead += first
+        if len(lengths) == 1:
+            return
+        if self.split:
+            self._close(self.trail)
+        self.split = True
+        for n in lengths[1:-1]:
+            self._close(n)
+        self.trail = lengths[-1]
+
+    def merge(self, other: '_RunStats'):
+        """Append the runs of the segment that directly follows this one"""
+        if not other.split:
+            self.extend([other.lead])
+            return
+        self.extend([other.lead, 0])
+        if other.count:
+            self.minimum = other.minimum if self.count == 0 else min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+        self.short += other.short
+        self.long += other.long
+        self.trail = other.trail
+
+    def closed(self) -> '_RunStats':
+        """Statistics with the lead and trail runs closed, as at the document edges"""
+        runs = _RunStats()
+        runs.extend([0, 0])
+        runs.merge(self)
+        runs.extend([0, 0])
+        return runs
+
+class _SegmentStats:
+    """Mergeable counters over text segments that start and end at safe cut points"""
+
+    def __init__(self):
+        self.char_counts = Counter()
+        self.char_count = 0
+        self.word_type_counts = Counter()
+        self.sentences = _RunStats()
+        self.paragraphs = _RunStats()
+        self.question_count = 0
+        self.header_count = 0
+        self.bullet_count = 0
+        self.numbered_list_count = 0
+        self.phrases = PhraseCounter(get_lexicon())
+
+    def add(self, segment: str):
+        if not segment:
+            return
+        self.char_counts.update(segment)
+        self.char_count += len(segment)
+        self.word_type_counts.update(segment.split())
+
+        pieces = SENTENCE_SPLIT_PATTERN.split(segment)
+        self.sentences.extend([len(piece.split()) for piece in pieces])
+        # Only inner pieces are whole sentences; a piece cut at a segment edge cannot end one
+        self.question_count += sum(1 for piece in pieces[1:-1] if piece.strip().endswith('?'))
+        self.paragraphs.extend([len(piece.split()) for piece in segment.split('\n\n')])
+
+        self.header_count += len(HEADER_PATTERN.findall(segment))
+        self.bullet_count += len(BULLET_PATTERN.findall(segment))
+        self.numbered_list_count += len(NUMBERED_LIST_PATTERN.findall(segment))
+        if self.phrases.window:
+            self.phrases.feed(segment.lower().split())
+
+    def merge(self, other: '_SegmentStats'):
+        self.char_counts.update(other.char_counts)
+        self.char_count += other.char_count
+        self.word_type_counts.update(other.word_type_counts)
+        self.sentences.merge(other.sentences)
+        self.paragraphs.merge(other.paragraphs)
+        self.question_count += other.question_count
+        self.header_count += other.header_count
+        self.bullet_count += other.bullet_count
+        self.numbered_list_count += other.numbered_list_count
+        self.phrases.merge(other.phrases)
+
+class StreamingScan:
+    """Incremental TextScan for text that arrives in chunks.
+
+    Only the text since the last safe cut point is buffered; everything before it
+    is folded into counters, so memory is bounded by vocabulary size rather than
+    document size. Scans of adjacent pieces of one document can be combined with
+    merge(), and finish() yields the same TextScan counters as scanning the whole
+    text at once.
+    """
+
+    def __init__(self):
+        self._head = ""
+        self._cut = False
+        self._body = _SegmentStats()
+        self._tail = ""
+
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        if not self._cut:
+            # Text before the first cut point may continue a segment fed to a preceding scan
+            self._head += chunk
+            match = SAFE_CUT_PATTERN.search(self._head)
+            if match is None:
+                return
+            self._cut = True
+            self._tail = self._head[match.end():]
+            self._head = self._head[:match.end()]
+        else:
+            self._tail += chunk
+
+        cut = _last_safe_cut(self._tail)
+        if cut:
+            self._body.add(self._tail[:cut])
+            self._tail = self._tail[cut:]
+
+    def merge(self, other: 'StreamingScan'):
+        """Append the scan of the text that directly follows this one"""
+        if not other._cut:
+            self.feed(other._head)
+            return
+        if not self._cut:
+            self._head += other._head
+            self._cut = True
+        else:
+            self._body.add(self._tail + other._head)
+        self._body.merge(other._body)
+        self._tail = other._tail
+
+    def finish(self) -> TextScan:
+        stats = _SegmentStats()
+        stats.add(self._head)
+        stats.merge(self._body)
+        stats.add(self._tail)
+
+        sentences = stats.sentences.closed()
+        paragraphs = stats.paragraphs.closed()
+        return TextScan.from_counts(
+            char_counts=stats.char_counts,
+            char_count=stats.char_count,
+            space_count=stats.char_counts[' '],
+            word_type_counts=stats.word_type_counts,
+            sentence_count=sentences.count,
+            sentence_length_total=sentences.total,
+            sentence_length_squares=sentences.squares,
+            short_sentence_count=sentences.short,
+            long_sentence_count=sentences.long,
+            question_count=stats.question_count,
+            paragraph_count=paragraphs.count,
+            paragraph_length_total=paragraphs.total,
+            paragraph_length_min=paragraphs.minimum,
+            paragraph_length_max=paragraphs.maximum,
+            header_count=stats.header_count,
+            bullet_count=stats.bullet_count,
+            numbered_list_count=stats.numbered_list_count,
+            phrase_sentiment=(stats.phrases.positive, stats.phrases.negative),
+        )
+
+def _last_safe_cut(text: str) -> int:
+    """Offset of the last safe cut point in text, or 0 if there is none"""
+    start = max(0, len(text) - SAFE_CUT_WINDOW)
+    while True:
+        cut = 0
+        for match in SAFE_CUT_PATTERN.finditer(text, start):
+            cut = match.end()
+        if cut or start == 0:
+            return cut
+        start = 0
+
+def scan_stream(chunks: Iterable[str]) -> TextScan:
+    scanner = StreamingScan()
+    for chunk in chunks:
+        scanner.feed(chunk)
+    return scanner.finish()
@@ -1,25 +1,80 @@
+import os
 import re
-import requests
 import asyncio
-from collections import Counter
-from typing import Optional
+import heapq
+import math
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import chain, repeat
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
-HF_API_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
+from cache import LRUCache, content_hash
+from executor import CPU_WORKERS, call_async, cpu_pool, reset_cpu_pool, submit_cpu, submit_io
+from inference import get_inference_client
+from lexicon import get_lexicon
+import textrank
+
+# Bump when sentence splitting or scoring changes, so stale rankings are ignored
+SUMMARY_VERSION = "1"
+SUMMARY_CACHE_SIZE = int(os.environ.get("SUMMARY_CACHE_SIZE", 128))
+
+# Sentences selected per summary length
+SUMMARY_SENTENCE_COUNTS = {"short": 2, "medium": 4, "long": 6}
+
+_ranking_cache = LRUCache(SUMMARY_CACHE_SIZE)
+# (text, ranking) that get_sentence_ranking returns without hashing, see shared_ranking
+_shared_ranking = ContextVar("shared_ranking", default=None)
+
+# Texts this long are ranked chunk by chunk on the CPU process pool (map) and the
+# chunk candidates re-ranked with whole-document statistics (reduce)
+HIERARCHICAL_SUMMARY_CHARS = int(os.environ.get("HIERARCHICAL_SUMMARY_CHARS", 500_000))
+SUMMARY_CHUNK_CHARS = int(os.environ.get("SUMMARY_CHUNK_CHARS", 100_000))
+# Candidates each chunk passes to the reduce step, at least the longest summary
+SUMMARY_CHUNK_SENTENCES = max(SUMMARY_SENTENCE_COUNTS.values()) + 2
+
+# Anytime ranking reads the text in blocks of about this many characters and
+# scores sentences in batches, checking the deadline in between
+ANYTIME_BLOCK_CHARS = int(os.environ.get("ANYTIME_BLOCK_CHARS", 32_768))
+ANYTIME_SCORE_BATCH = int(os.environ.get("ANYTIME_SCORE_BATCH", 1024))
+
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Sentences containing any of these (anywhere, even inside a word) score higher
+KEY_PHRASES = [
+    'important', 'significant', 'shows', 'indicates', 'found',
+    'results', 'conclusion', 'therefore', 'however', 'moreover',
+    'furthermore', 'additionally', 'consequently', 'specifically'
+]
+KEY_PHRASE_PATTERN = re.compile('|'.join(map(re.escape, KEY_PHRASES)))
+
+# Words of three or more letters, the terms of TextRank sentence vectors
+TERM_PATTERN = re.compile(r'[^\W\d_]{3,}')
+
+NO_CONTENT_MESSAGE = "No meaningful content found to summarize. Please check that your document contains readable text."
+UNABLE_MESSAGE = "Unable to generate a meaningful summary from the provided content."
 
 async def summarize_text(text: str, length: str = "medium") -> str:
     extractive_summary = create_extractive_summary(text, length)
     
-    if not extractive_summary or extractive_summary == "Unable to generate a meaningful summary from the provided content.":
-        return "No meaningful content found to summarize. Please check that your document contains readable text."
-    
-    word_count = len(text.split())
+    if not extractive_summary or extractive_summary == UNABLE_MESSAGE:
+        return NO_CONTENT_MESSAGE
     
+    word_count = get_sentence_ranking(text).word_count
+    return extractive_summary + summary_footer(word_count, length)
+
+def summary_footer(word_count: int, length: str) -> str:
+    """Document details appended after the summary sentences"""
     if length == "short":
-        return extractive_summary
+        return ""
     elif length == "medium":
-        return f"{extractive_summary}\n\n[Document contains {word_count:,} words]"
+        return f"\n\n[Document contains {word_count:,} words]"
     else:  # long
-        return f"{extractive_summary}\n\n[This {word_count:,}-word document provides detailed information on the topic. The summary above captures the key points and main ideas presented in the content.]"
+        return f"\n\n[This {word_count:,}-word document provides detailed information on the topic. The summary above captures the key points and main ideas presented in the content.]"
 
 async def get_huggingface_summary(text: str, length: str) -> Optional[str]:
     try:
@@ -34,139 +89,503 @@ async def get_huggingface_summary(text: str, length: str) -> Optional[str]:
         # Use more text for better summaries
         input_text = text[:2048] if len(text) > 2048 else text
         
-        payload = {
-            "inputs": input_text,
-            "parameters": {
-                "max_length": params["max_length"],
-                "min_length": params["min_length"],
-                "do_sample": True,
-                "temperature": 0.7,
-                "repetition_penalty": 1.2,
-                "length_penalty": 1.0
-            }
+        parameters = {
+            "max_length": params["max_length"],
+            "min_length": params["min_length"],
+            "do_sample": True,
+            "temperature": 0.7,
+            "repetition_penalty": 1.2,
+            "length_penalty": 1.0
         }
         
-        response = requests.post(HF_API_URL, json=payload, timeout=45)
+        summary = await get_inference_client().summarize(input_text, parameters)
         
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list) and len(result) > 0:
-                summary = result[0].get("summary_text", "")
+        if summary and len(summary) > 30:
+            word_count = len(text.split())
+            
+            structured_summary = f"**DOCUMENT SUMMARY**\n\n"
+            structured_summary += f"**Main Content:** {summary}\n\n"
+            
+            if length in ["medium", "long"]:
+                structured_summary += f"**Document Details:** {word_count:,} words | "
+                structured_summary += f"{'Comprehensive' if word_count > 500 else 'Focused'} Analysis\n\n"
                 
-                if summary and len(summary) > 30:
-                    word_count = len(text.split())
-                    
-                    structured_summary = f"**DOCUMENT SUMMARY**\n\n"
-                    structured_summary += f"**Main Content:** {summary}\n\n"
-                    
-                    if length in ["medium", "long"]:
-                        structured_summary += f"**Document Details:** {word_count:,} words | "
-                        structured_summary += f"{'Comprehensive' if word_count > 500 else 'Focused'} Analysis\n\n"
-                        
-                        if length == "long":
-                            structured_summary += f"**Professional Value:** This summary provides actionable insights suitable for strategic planning, research, and decision-making processes."
-                    
-                    return structured_summary
-                    
-                return summary
+                if length == "long":
+                    structured_summary += f"**Professional Value:** This summary provides actionable insights suitable for strategic planning, research, and decision-making processes."
+            
+            return structured_summary
         
-        return None
+        return summary or None
     except:
         return None
 
-def create_extractive_summary(text: str, length: str = "medium") -> str:
-    if not text or len(text.strip()) < 20:
-        return "Insufficient content to generate a meaningful summary."
+def create_extractive_summary(text: str, length: str = "medium", method: str = "frequency") -> str:
+    """Select the best sentences by the frequency heuristic or, with method="textrank", by graph centrality"""
+    sentences, message = select_summary_sentences(text, length, method)
+    return message if message else ' '.join(sentences)
+
+def summary_selection(text: str, length: str = "medium", method: str = "frequency"):
+    """(sentences, message, word_count): select_summary_sentences plus the document word count"""
+    sentences, message = select_summary_sentences(text, length, method)
+    return sentences, message, get_sentence_ranking(text).word_count
+
+def select_summary_sentences(text: str, length: str = "medium", method: str = "frequency"):
+    """Summary sentences in document order, or ([], message) when there is nothing to select"""
+    ranking = get_sentence_ranking(text)
+    if ranking.message:
+        return [], ranking.message
     
-    text = text.strip()
+    sentences = ranking.sentences
+    if len(sentences) <= 2:
+        return list(sentences), None
     
-    import re
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 20 and len(s.split()) >= 3]
+    target_sentences = min(SUMMARY_SENTENCE_COUNTS.get(length, SUMMARY_SENTENCE_COUNTS["long"]), len(sentences))
     
-    if len(sentences) == 0:
-        return "No complete sentences found in the document."
+    scores = ranking.textrank_scores() if method == "textrank" else ranking.scores
+    # Sentences are already stripped, so normalizing each one equals normalizing the joined summary
+    selected = [re.sub(r'\s+', ' ', sentence) for sentence in ranking.top(target_sentences, scores)]
     
-    if len(sentences) <= 2:
-        return ' '.join(sentences)
+    if not selected:
+        return [], UNABLE_MESSAGE
+    if not selected[-1][-1] in '.!?':
+        selected[-1] += '.'
     
-    word_count = len(text.split())
+    return selected, None
+
+class SentenceRanking:
+    """Scored sentences of one document, shared by every summary type and length"""
     
-    if length == "short":
-        target_sentences = min(2, len(sentences))
-    elif length == "medium":
-        target_sentences = min(4, len(sentences))
-    else:  # long
-        target_sentences = min(6, len(sentences))
-    
-    sentence_scores = []
-    
-    all_words = text.lower().split()
-    word_freq = {}
-    for word in all_words:
-        if len(word) > 3 and word.isalpha():
-            word_freq[word] = word_freq.get(word, 0) + 1
-    stop_words = {
-        'this', 'that', 'these', 'those', 'with', 'from', 'they', 'them', 'their',
-        'would', 'could', 'should', 'will', 'been', 'have', 'had', 'has', 'was',
-        'were', 'are', 'is', 'be', 'being', 'do', 'does', 'did', 'done', 'the',
-        'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'as', 'by'
+    def __init__(self, sentences: List[str], scores: List[float], word_count: int, message: Optional[str] = None):
+        self.sentences = sentences
+        self.scores = scores
+        self.word_count = word_count
+        self.message = message
+        self._textrank_scores = None
+    
+    def top(self, count: int, scores: Optional[List[float]] = None) -> List[str]:
+        """The count best sentences by scores (default: the frequency scores), in document order"""
+        scores = self.scores if scores is None else scores
+        # nlargest keeps equally scored sentences in document order, like a stable sort
+        best = heapq.nlargest(count, range(len(scores)), key=scores.__getitem__)
+        return [self.sentences[i] for i in sorted(best)]
+    
+    def textrank_scores(self) -> List[float]:
+        """Graph centrality scores, computed on first use and kept with the cached ranking"""
+        if self._textrank_scores is None:
+            if not textrank.NUMPY_AVAILABLE:
+                return self.scores
+            stop_words = get_lexicon().summary_stop_words
+            sentence_terms = [
+                [term for term in TERM_PATTERN.findall(sentence.lower()) if term not in stop_words]
+                for sentence in self.sentences
+            ]
+            self._textrank_scores = textrank.textrank_scores(sentence_terms)
+        return self._textrank_scores
+
+def get_sentence_ranking(text: Union[str, SentenceRanking]) -> SentenceRanking:
+    """Scored sentences for text, cached by content hash; a ranking given in place of the text is returned as is"""
+    if isinstance(text, SentenceRanking):
+        return text
+    shared = _shared_ranking.get()
+    if shared is not None and shared[0] is text:
+        return shared[1]
+    key = content_hash(text, SUMMARY_VERSION)
+    ranking = _ranking_cache.get(key)
+    if ranking is None:
+        if len(text) >= HIERARCHICAL_SUMMARY_CHARS:
+            ranking = hierarchical_ranking(text)
+        else:
+            ranking = score_sentences(text)
+        _ranking_cache.put(key, ranking)
+    return ranking
+
+@contextmanager
+def shared_ranking(text: str, ranking: Optional[SentenceRanking] = None):
+    """Score text once (or use the given ranking) for every summary built from it in this context.
+    
+    Unlike the cache, this holds even when the ranking is evicted or caching is
+    disabled, and skips hashing the text again for each summary.
+    """
+    token = _shared_ranking.set((text, get_sentence_ranking(text) if ranking is None else ranking))
+    try:
+        yield
+    finally:
+        _shared_ranking.reset(token)
+
+def get_summary_cache_stats() -> Dict:
+    return _ranking_cache.stats()
+
+@lru_cache(maxsize=1)
+def _digit_pattern() -> re.Pattern:
+    """Matches exactly the characters str.isdigit accepts (\\d plus superscripts and the like)"""
+    extra = [c for c in map(chr, range(sys.maxunicode + 1)) if c.isdigit() and not c.isdecimal()]
+    return re.compile('[\\d' + ''.join(map(re.escape, extra)) + ']')
+
+def score_sentences(text: str) -> SentenceRanking:
+    """Score every sentence in one pass over its tokens.
+    
+    Each sentence is lowercased and tokenized once; word weights are the document
+    frequencies of non-stopword alphabetic words longer than three characters, and
+    key phrases are found with one precompiled regex.
+    """
+    if not text or len(text.strip()) < 20:
+        return SentenceRanking([], [], len(text.split()) if text else 0, "Insufficient content to generate a meaningful summary.")
+    
+    text = text.strip()
+    # Lowercasing never adds or removes whitespace, so this also gives the word count
+    word_counts = Counter(text.lower().split())
+    word_count = sum(word_counts.values())
+    
+    sentences, tokenized = _split_sentences(text)
+    if len(sentences) == 0:
+        return SentenceRanking([], [], word_count, "No complete sentences found in the document.")
+    
+    scores = _sentence_scores(sentences, tokenized, _word_weights(word_counts), range(len(sentences)), len(sentences))
+    return SentenceRanking(sentences, scores, word_count)
+
+def _split_sentences(text: str):
+    """Summary candidate sentences of text and their (lowercased, words) tokens"""
+    sentences = []
+    tokenized = []
+    for sentence in map(str.strip, SENTENCE_BOUNDARY_PATTERN.split(text)):
+        if len(sentence) > 20:
+            lowered = sentence.lower()
+            words = lowered.split()
+            if len(words) >= 3:
+                sentences.append(sentence)
+                tokenized.append((lowered, words))
+    return sentences, tokenized
+
+def _word_weights(word_counts: Counter) -> Dict[str, int]:
+    """Sentence scoring weights: counts of non-stopword alphabetic words longer than three characters"""
+    stop_words = get_lexicon().summary_stop_words
+    return {
+        word: n for word, n in word_counts.items()
+        if len(word) > 3 and word.isalpha() and word not in stop_words
     }
+
+def _sentence_scores(sentences, tokenized, weights, positions=None, sentence_total: int = 0) -> List[float]:
+    """Scores of sentences at the given positions among sentence_total document sentences.
     
-    for i, sentence in enumerate(sentences):
-        score = 0
-        words = sentence.lower().split()
-        
-        important_words = 0
-        for word in words:
-            if word not in stop_words and len(word) > 3:
-                if word in word_freq:
-                    score += word_freq[word]
-                    important_words += 1
-        
-        if len(words) > 0:
-            score = score / len(words)
+    Without positions the sentences are scored without the position bonuses.
+    """
+    weight_of = weights.get
+    has_digit = _digit_pattern().search
+    last = sentence_total - 1
+    early = sentence_total * 0.3
+    scores = []
+    
+    for i, sentence, (lowered, words) in zip(repeat(None) if positions is None else positions, sentences, tokenized):
+        score = sum(map(weight_of, words, repeat(0))) / len(words)
         
-        if i == 0:
-            score *= 1.5  
-        elif i == len(sentences) - 1:
-            score *= 1.2 
-        elif i < len(sentences) * 0.3:
-            score *= 1.1  
+        if i is None:
+            pass
+        elif i == 0:
+            score *= 1.5
+        elif i == last:
+            score *= 1.2
+        elif i < early:
+            score *= 1.1
         
         if len(words) < 5 or len(words) > 40:
             score *= 0.5
         
-        if any(word.isupper() or word[0].isupper() for word in words):
+        # Only possible when the lowercased sentence still has an uppercase character
+        if not lowered.islower() and any(word.isupper() or word[0].isupper() for word in words):
             score *= 1.1
         
-        if any(char.isdigit() for char in sentence):
+        if has_digit(sentence):
             score *= 1.1
         
-        key_phrases = ['important', 'significant', 'shows', 'indicates', 'found', 
-                      'results', 'conclusion', 'therefore', 'however', 'moreover',
-                      'furthermore', 'additionally', 'consequently', 'specifically']
+        if KEY_PHRASE_PATTERN.search(lowered):
+            score *= 1.2
         
-        for phrase in key_phrases:
-            if phrase in sentence.lower():
-                score *= 1.2
+        scores.append(score)
+    
+    return scores
+
+def hierarchical_ranking(text: str) -> SentenceRanking:
+    """Map-reduce ranking for book-length texts, score_sentences' ranking restricted to the best sentences.
+    
+    The text is cut at sentence boundaries into at most about four chunks per
+    worker, so every sentence lands in exactly one chunk. A first map counts
+    each chunk's words and sentences in the process pool; their sums give the
+    document's word weights and each chunk's first sentence position. A second
+    map scores each chunk's sentences with those weights at their document
+    positions, exactly as score_sentences would, and keeps its best. Any
+    summary's sentences are among the best of their chunks, so summaries are
+    the single-pass ones. The ranking only keeps the candidates, so its size
+    is bounded by the worker count and not by the length of the text.
+    """
+    text = text.strip()
+    chunk_chars = max(SUMMARY_CHUNK_CHARS, math.ceil(len(text) / (CPU_WORKERS * 4)))
+    chunks = _split_chunks(text, chunk_chars)
+    
+    counts = _map_chunks(_count_chunk, chunks)
+    word_count = sum(chunk_words for chunk_words, _, _ in counts)
+    weights = Counter()
+    offsets = []
+    sentence_total = 0
+    for _, chunk_weights, chunk_sentences in counts:
+        weights.update(chunk_weights)
+        offsets.append(sentence_total)
+        sentence_total += chunk_sentences
+    
+    if not sentence_total:
+        return SentenceRanking([], [], word_count, "No complete sentences found in the document.")
+    
+    # Each chunk is sent the document weights of its own words only
+    chunk_weights = [{word: weights[word] for word in result[1]} for result in counts]
+    candidates = _map_chunks(_best_in_chunk, chunks, chunk_weights, offsets, repeat(sentence_total), repeat(SUMMARY_CHUNK_SENTENCES))
+    sentences = []
+    scores = []
+    for chunk_candidates in candidates:
+        for sentence, score in chunk_candidates:
+            sentences.append(sentence)
+            scores.append(score)
+    return SentenceRanking(sentences, scores, word_count)
+
+def stream_ranking(chunks: Iterable[str]) -> SentenceRanking:
+    """Approximate ranking of the concatenated chunks, read once and lazily.
+    
+    The chunks (of a file, say, see text_reader.iter_text_chunks) are re-cut at
+    sentence boundaries into pieces of about SUMMARY_CHUNK_CHARS and mapped
+    with a bounded number in flight, so memory does not grow with the text.
+    Unlike hierarchical_ranking, a single pass cannot know the document's word
+    weights before it picks each piece's candidates, so they are picked with
+    the piece's own weights and no position bonus. The candidates are then
+    scored exactly as score_sentences would, but a sentence that only the
+    document weights would rank highly can be missed.
+    """
+    pieces = _sentence_aligned(chunks, SUMMARY_CHUNK_CHARS)
+    first = next(pieces)
+    second = next(pieces, None)
+    if second is None:
+        # A short text, never cut
+        return score_sentences(first)
+    return _reduce_chunks(_map_chunk_stream(chain([first, second], pieces)))
+
+def _reduce_chunks(results: Iterable) -> SentenceRanking:
+    """Streamed reduce step: sum the chunk weights and rescore the candidates at their document positions"""
+    word_count = 0
+    weights = Counter()
+    sentence_total = 0
+    positions = []
+    sentences = []
+    for chunk_words, chunk_weights, chunk_sentences, candidates in results:
+        word_count += chunk_words
+        weights.update(chunk_weights)
+        positions.extend(sentence_total + i for i, _ in candidates)
+        sentences.extend(sentence for _, sentence in candidates)
+        sentence_total += chunk_sentences
+    
+    if not sentences:
+        return SentenceRanking([], [], word_count, "No complete sentences found in the document.")
+    
+    tokenized = [(lowered, lowered.split()) for lowered in map(str.lower, sentences)]
+    scores = _sentence_scores(sentences, tokenized, weights, positions, sentence_total)
+    return SentenceRanking(sentences, scores, word_count)
+
+def _split_chunks(text: str, chunk_chars: int) -> List[str]:
+    """Chunks of at least chunk_chars characters, cut where SENTENCE_BOUNDARY_PATTERN splits"""
+    return [chunk for chunk, _ in _iter_chunks(text, chunk_chars)]
+
+def _iter_chunks(text: str, chunk_chars: int):
+    """(chunk, end offset) pairs of _split_chunks, produced lazily"""
+    start = 0
+    while len(text) - start > chunk_chars:
+        match = SENTENCE_BOUNDARY_PATTERN.search(text, start + chunk_chars)
+        if not match:
+            break
+        yield text[start:match.start()], match.end()
+        start = match.end()
+    yield text[start:], len(text)
+
+def _sentence_aligned(chunks: Iterable[str], chunk_chars: int) -> Iterator[str]:
+    """Pieces of at least chunk_chars characters of the joined chunks, cut as _iter_chunks cuts"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        while len(pending) > chunk_chars:
+            match = SENTENCE_BOUNDARY_PATTERN.search(pending, chunk_chars)
+            # Whitespace running to the end may continue in the next chunk
+            if not match or match.end() == len(pending):
                 break
-        
-        sentence_scores.append((score, i, sentence))
+            yield pending[:match.start()]
+            pending = pending[match.end():]
+    yield pending
+
+def _map_chunk_stream(chunks: Iterable[str]) -> Iterator:
+    """_map_chunks for an iterator, with at most two chunks per worker submitted at a time"""
+    pool = cpu_pool() if CPU_WORKERS > 1 else None
+    pending = deque()
+    for chunk in chunks:
+        if pool is None:
+            yield _summarize_chunk(chunk, SUMMARY_CHUNK_SENTENCES)
+            continue
+        try:
+            pending.append((chunk, pool.submit(_summarize_chunk, chunk, SUMMARY_CHUNK_SENTENCES)))
+        except (BrokenProcessPool, OSError) as e:
+            pool = _drop_pool(e)
+            pending.append((chunk, None))
+        while pending and (len(pending) >= 2 * CPU_WORKERS or pool is None):
+            result, pool = _chunk_result(*pending.popleft(), pool)
+            yield result
+    while pending:
+        result, pool = _chunk_result(*pending.popleft(), pool)
+        yield result
+
+def _chunk_result(chunk: str, future, pool):
+    """(map result, pool to keep using) of a submitted chunk, mapped in-process if the pool failed"""
+    if future is not None:
+        try:
+            return future.result(), pool
+        except (BrokenProcessPool, OSError) as e:
+            pool = _drop_pool(e) if pool is not None else None
+    return _summarize_chunk(chunk, SUMMARY_CHUNK_SENTENCES), pool
+
+def _drop_pool(error: Exception):
+    # A worker died or processes cannot be started here: drop the pool and map in-process
+    print(f"Summary process pool unavailable, ranking chunks in-process: {str(error)}")
+    reset_cpu_pool()
+    return None
+
+def _map_chunks(fn: Callable, chunks: List[str], *args: Iterable) -> list:
+    """[fn(chunk, *chunk_args)] for each chunk, over the process pool when there is one"""
+    pool = cpu_pool()
+    if pool is not None and CPU_WORKERS > 1 and len(chunks) > 1:
+        try:
+            return list(pool.map(fn, chunks, *args))
+        except (BrokenProcessPool, OSError) as e:
+            _drop_pool(e)
+    return list(map(fn, chunks, *args))
+
+def _count_chunk(chunk: str):
+    """First map step: (word count, word weights, sentence count) of a chunk"""
+    word_counts = Counter(chunk.lower().split())
+    return sum(word_counts.values()), _word_weights(word_counts), len(_split_sentences(chunk)[0])
+
+def _best_in_chunk(chunk: str, weights: Dict[str, int], offset: int, sentence_total: int, count: int):
+    """Second map step: [(sentence, score)] of the count best sentences, scored at their document positions"""
+    sentences, tokenized = _split_sentences(chunk)
+    scores = _sentence_scores(sentences, tokenized, weights, range(offset, offset + len(sentences)), sentence_total)
+    # nlargest prefers earlier sentences among equal scores, as ranking.top does over the document
+    best = sorted(heapq.nlargest(count, range(len(scores)), key=scores.__getitem__))
+    return [(sentences[i], scores[i]) for i in best]
+
+def _summarize_chunk(chunk: str, count: int):
+    """Streamed map step: (word count, word weights, sentence count, [(index, sentence)] of the candidates).
     
-    sentence_scores.sort(reverse=True, key=lambda x: x[0])
+    Position bonuses depend on where the chunk lies in the document, so the count
+    best sentences are picked without them, and the first and last sentences,
+    which may be the document's, are always kept.
+    """
+    word_counts = Counter(chunk.lower().split())
+    weights = _word_weights(word_counts)
+    sentences, tokenized = _split_sentences(chunk)
+    scores = _sentence_scores(sentences, tokenized, weights)
+    best = set(heapq.nlargest(count, range(len(scores)), key=scores.__getitem__))
+    if sentences:
+        best.update((0, len(sentences) - 1))
+    best = sorted(best)
+    return sum(word_counts.values()), weights, len(sentences), [(i, sentences[i]) for i in best]
+
+def anytime_ranking(text: str, deadline: float):
+    """(ranking, complete): the best ranking that fits before deadline, a time.time() value.
+    
+    The deadline is set when the request arrives, so time spent queueing for a
+    worker and sending it the text counts against the budget. The text is read
+    block by block from the start, so the lead sentences are always ranked
+    first. Reading stops halfway to the deadline and word weights come from the
+    part read so far; sentences are then scored in batches until the deadline.
+    The lead block and first batch are always done, so there is always a
+    summary; when the budget is already spent on arrival, that is all that is
+    done, without hashing or copying the rest of the text. A ranking that gets
+    through the whole text is exactly score_sentences' and is cached; partial
+    rankings are not.
+    """
+    start = time.time()
+    reading_deadline = start + (deadline - start) / 2
+    
+    shared = _shared_ranking.get()
+    if shared is not None and shared[0] is text:
+        return shared[1], True
+    lead_chars = 2 * ANYTIME_BLOCK_CHARS
+    if start >= deadline and len(text) > lead_chars:
+        # Long enough that the lead block ends before the end of this prefix
+        ranking, _ = _rank_blocks(text[:lead_chars].strip(), len(text), reading_deadline, deadline)
+        return ranking, False
+    key = content_hash(text, SUMMARY_VERSION)
+    ranking = _ranking_cache.get(key)
+    if ranking is not None:
+        return ranking, True
+    if not text or len(text.strip()) < 20:
+        return score_sentences(text), True
+    
+    stripped = text.strip()
+    ranking, complete = _rank_blocks(stripped, len(stripped), reading_deadline, deadline)
+    if complete:
+        _ranking_cache.put(key, ranking)
+    return ranking, complete
+
+def _rank_blocks(text: str, total_chars: int, reading_deadline: float, deadline: float):
+    """(ranking, complete) of the blocks of text read by reading_deadline, text being the start of total_chars"""
+    word_counts = Counter()
+    sentences = []
+    tokenized = []
+    read = 0
+    for chunk, read in _iter_chunks(text, ANYTIME_BLOCK_CHARS):
+        word_counts.update(chunk.lower().split())
+        chunk_sentences, chunk_tokens = _split_sentences(chunk)
+        sentences += chunk_sentences
+        tokenized += chunk_tokens
+        if time.time() >= reading_deadline:
+            break
+    read_all = read == total_chars
     
-    selected_sentences = sentence_scores[:target_sentences]
-    selected_sentences.sort(key=lambda x: x[1])
-    final_sentences = [sentence for _, _, sentence in selected_sentences]
-    summary = ' '.join(final_sentences)
-    summary = re.sub(r'\s+', ' ', summary) 
-    summary = summary.strip()
+    # Unread text is assumed to be like the text read so far
+    scale = total_chars / read if read else 1.0
+    word_count = sum(word_counts.values())
+    if not read_all:
+        word_count = round(word_count * scale)
+    if not sentences:
+        return SentenceRanking([], [], word_count, "No complete sentences found in the document."), read_all
+    # Position bonuses need the sentence total; estimate it for a partial read
+    sentence_total = len(sentences) if read_all else round(len(sentences) * scale)
+    
+    weights = _word_weights(word_counts)
+    scores = []
+    while len(scores) < len(sentences):
+        batch = slice(len(scores), len(scores) + ANYTIME_SCORE_BATCH)
+        scores += _sentence_scores(sentences[batch], tokenized[batch], weights, range(batch.start, batch.stop), sentence_total)
+        if time.time() >= deadline:
+            break
     
-    if summary and not summary[-1] in '.!?':
-        summary += '.'
+    complete = read_all and len(scores) == len(sentences)
+    return SentenceRanking(sentences[:len(scores)], scores, word_count), complete
+
+async def run_summary_task(fn: Callable, text: str, *args, fan_out: bool = True):
+    """Run fn(text, *args) off the event loop, see submit_summary_task"""
+    return await submit_summary_task(fn, text, *args, fan_out=fan_out)
+
+def submit_summary_task(fn: Callable, text: str, *args, fan_out: bool = True) -> asyncio.Future:
+    """Start fn(text, *args), a summary builder or any function ranking text, off the event loop.
     
-    return summary if summary else "Unable to generate a meaningful summary from the provided content."
+    Rankings are CPU-bound, so they run in the process pool. Book-length texts
+    instead get a thread of this process, from which hierarchical_ranking maps
+    their chunks over the whole process pool; pass fan_out=False for functions
+    that rank without get_sentence_ranking, such as anytime_ranking, so they
+    never do their CPU work in this process. Coroutine functions are run to
+    completion on the worker's own event loop. Raises Overloaded at once when
+    the pool's queue is full.
+    """
+    if asyncio.iscoroutinefunction(fn):
+        fn, args = call_async, (fn, text) + args
+    else:
+        args = (text,) + args
+    if fan_out and len(text) >= HIERARCHICAL_SUMMARY_CHARS:
+        return submit_io(fn, *args)
+    return submit_cpu(fn, *args)
 
 async def create_bullet_summary(text: str, length: str = "medium") -> str:
     base_summary = create_extractive_summary(text, length)
@@ -194,16 +613,88 @@ async def create_executive_summary(text: str, length: str = "medium") -> str:
     if not base_summary or "Unable to generate" in base_summary:
         return "EXECUTIVE SUMMARY\n\nNo meaningful content found to summarize."
     
-    word_count = len(text.split())
-    executive_parts = []
-    executive_parts.append("EXECUTIVE SUMMARY")
-    executive_parts.append("=" * 40)
-    executive_parts.append("")
-    executive_parts.append("OVERVIEW:")
-    executive_parts.append(base_summary)
-    executive_parts.append("")
-    executive_parts.append(f"DOCUMENT DETAILS:")
-    executive_parts.append(f"• Word Count: {word_count:,}")
-    executive_parts.append(f"• Content Type: {'Detailed Analysis' if word_count > 500 else 'Summary Document'}")
-    
-    return "\n".join(executive_parts)
\ No newline at end of file
+    word_count = get_sentence_ranking(text).word_count
+    return EXECUTIVE_HEADER + base_summary + executive_footer(word_count)
+
+EXECUTIVE_HEADER = "\n".join(["EXECUTIVE SUMMARY", "=" * 40, "", "OVERVIEW:", ""])
+
+def executive_footer(word_count: int) -> str:
+    return "\n".join([
+        "",
+        "",
+        "DOCUMENT DETAILS:",
+        f"• Word Count: {word_count:,}",
+        f"• Content Type: {'Detailed Analysis' if word_count > 500 else 'Summary Document'}",
+    ])
+
+async def create_textrank_summary(text: str, length: str = "medium") -> str:
+    summary = create_extractive_summary(text, length, method="textrank")
+    
+    if not summary or summary == UNABLE_MESSAGE:
+        return NO_CONTENT_MESSAGE
+    
+    return summary
+
+def stream_summary(text: str, summary_type: str = "standard", length: str = "medium"):
+    """Summary events: start, one per sentence or bullet in document order, then done.
+    
+    The ranking is submitted to the process pool on the call, so a full queue
+    raises Overloaded before any event exists; the start event then goes out
+    without waiting for it. Each event's "text" is the next piece of the
+    summary, separators included, so appending them all gives exactly the
+    non-streamed summary; the done event carries the footer and the document
+    word count.
+    """
+    if summary_type == "detailed":
+        length = "long"
+    method = "textrank" if summary_type == "textrank" else "frequency"
+    selection = submit_summary_task(summary_selection, text, length, method)
+    return _summary_events(selection, summary_type, length)
+
+async def _summary_events(selection: asyncio.Future, summary_type: str, length: str):
+    yield {"event": "start", "type": summary_type, "length": length, "text": ""}
+    sentences, message, word_count = await selection
+    
+    # The ranking message (too little text) stands in for the sentences, as in the joined summary
+    parts = [message] if message else sentences
+    no_content = message == UNABLE_MESSAGE
+    footer = ""
+    
+    if summary_type == "bullet_points":
+        if no_content:
+            pieces = ["• No meaningful content found to summarize"]
+        else:
+            pieces = [f"• {bullet}" for bullet in _bullets(parts)] or ["• No key points identified"]
+        separator = "\n"
+    elif summary_type == "executive":
+        if no_content:
+            pieces = ["EXECUTIVE SUMMARY\n\nNo meaningful content found to summarize."]
+        else:
+            pieces = [EXECUTIVE_HEADER + parts[0]] + parts[1:]
+            footer = executive_footer(word_count)
+        separator = " "
+    else:
+        if no_content:
+            pieces = [NO_CONTENT_MESSAGE]
+        else:
+            pieces = parts
+            if summary_type != "textrank":
+                footer = summary_footer(word_count, length)
+        separator = " "
+    
+    for i, piece in enumerate(pieces):
+        yield {"event": "sentence", "index": i, "text": piece if i == 0 else separator + piece}
+    yield {"event": "done", "text": footer, "word_count": word_count, "sentence_count": len(pieces)}
+
+def _bullets(sentences: List[str]):
+    """Bullet texts of the joined sentences split on periods, found sentence by sentence"""
+    pending = ""
+    for i, sentence in enumerate(sentences):
+        pending += (' ' if i else '') + sentence
+        *complete, pending = pending.split('.')
+        for piece in map(str.strip, complete):
+            if piece and len(piece) > 10:
+                yield piece
+    piece = pending.strip()
+    if piece and len(piece) > 10:
+        yield piece
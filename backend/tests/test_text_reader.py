@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from text_reader import detect_encoding, read_text_file
+
+SAMPLE = "Quarterly results: revenue grew 12% over the year.\nCafé owners reported strong demand.\n" * 20
+
+def test_bomless_utf16_is_detected():
+    assert detect_encoding(SAMPLE.encode("utf-16-le")) == "utf-16-le"
+    assert detect_encoding(SAMPLE.encode("utf-16-be")) == "utf-16-be"
+
+def test_bomless_utf16_file_decodes(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_bytes(SAMPLE.encode("utf-16-le"))
+    assert read_text_file(str(path)) == SAMPLE.strip()
+
+def test_utf8_and_bom_detection_unchanged():
+    assert detect_encoding(SAMPLE.encode("utf-8")) == "utf-8"
+    assert detect_encoding(SAMPLE.encode("utf-16")) == "utf-16"
+    # Windows-1252 is left to statistical detection, which may pick an equivalent code page
+    data = SAMPLE.encode("cp1252")
+    assert data.decode(detect_encoding(data)) == SAMPLE
@@ -1,38 +1,100 @@
 import os
 import re
-from PIL import Image
-from PyPDF2 import PdfReader
-
-try:
-    import pytesseract
-    if os.name == 'nt':
-        tesseract_path = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-        if os.path.exists(tesseract_path):
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
-    TESSERACT_AVAILABLE = True
-except ImportError:
-    TESSERACT_AVAILABLE = False
-    pytesseract = None
-
-async def extract_text_from_file(file_path: str) -> str:
+from typing import Callable, Dict, Optional
+
+import database
+from cache import LRUCache, file_hash
+from executor import run_io
+from ocr import TESSERACT_AVAILABLE, OCRBusy, ocr_file
+from pdf_extraction import extract_pdf_text
+from text_reader import read_text_file
+
+# Bump when any extractor's output changes, so stale cached text is ignored
+EXTRACTION_VERSION = "2"
+EXTRACTION_CACHE_SIZE = int(os.environ.get("EXTRACTION_CACHE_SIZE", 32))
+
+_extraction_cache = LRUCache(EXTRACTION_CACHE_SIZE)
+_persistent_extraction_stats = {"hits": 0, "misses": 0, "errors": 0}
+
+async def extract_text_from_file(file_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None,
+                                 file_sha256: Optional[str] = None) -> str:
+    """Extract text by file type; PDF and OCR results are cached by file hash (computed if not given)"""
     ext = os.path.splitext(file_path)[1].lower()
     
     if ext == '.pdf':
-        return extract_text_from_pdf(file_path)
+        digest = file_sha256 or file_hash(file_path)
+        pages = "all" if first_page is None and last_page is None else f"{first_page}-{last_page}"
+        return await _cached_extraction(
+            f"{EXTRACTION_VERSION}:pdf:{pages}:{digest}",
+            lambda: extract_text_from_pdf(file_path, first_page, last_page, digest)
+        )
     elif ext in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
-        return extract_text_from_image(file_path)
+        digest = file_sha256 or file_hash(file_path)
+        return await _cached_extraction(f"{EXTRACTION_VERSION}:image:{digest}", lambda: extract_text_from_image(file_path))
     elif ext == '.txt':
-        return extract_text_from_txt(file_path)
+        return await run_io(extract_text_from_txt, file_path)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
 
-def extract_text_from_pdf(file_path: str) -> str:
+async def _cached_extraction(key: str, extract: Callable[[], str]) -> str:
+    """Text for key from the in-process cache, then documents.db, else extracted and stored in both.
+    
+    The SQLite lookup and the extraction run in the I/O pool so parsing and OCR
+    never stall the event loop; PDF pages fan out further to the CPU pool.
+    """
+    text = _extraction_cache.get(key)
+    if text is None:
+        text = await run_io(_load_or_extract, key, extract)
+        _extraction_cache.put(key, text)
+    return text
+
+def _load_or_extract(key: str, extract: Callable[[], str]) -> str:
+    text = _load_persistent_extraction(key)
+    if text is None:
+        text = extract()
+        _store_persistent_extraction(key, text)
+    return text
+
+def _load_persistent_extraction(key: str):
+    try:
+        text = database.get_cached_extraction(key)
+    except Exception as e:
+        _persistent_extraction_stats["errors"] += 1
+        print(f"Extraction cache lookup failed: {str(e)}")
+        return None
+    
+    if text is None:
+        _persistent_extraction_stats["misses"] += 1
+    else:
+        _persistent_extraction_stats["hits"] += 1
+    return text
+
+def _store_persistent_extraction(key: str, text: str):
+    try:
+        database.save_cached_extraction(key, text)
+    except Exception as e:
+        _persistent_extraction_stats["errors"] += 1
+        print(f"Extraction cache store failed: {str(e)}")
+
+def get_extraction_cache_stats() -> Dict:
+    """Hit/miss counters for the in-process and SQLite extraction cache tiers"""
+    persistent = dict(_persistent_extraction_stats)
+    lookups = persistent["hits"] + persistent["misses"]
+    persistent["hit_rate"] = round(persistent["hits"] / lookups, 3) if lookups else 0.0
+    try:
+        persistent.update(database.get_extraction_cache_stats())
+    except Exception as e:
+        persistent["error"] = str(e)
+    
+    return {"memory": _extraction_cache.stats(), "persistent": persistent}
+
+def extract_text_from_pdf(file_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None,
+                          file_sha256: Optional[str] = None) -> str:
+    """Text of a PDF or of pages first_page..last_page (1-based, inclusive)"""
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        return extract_pdf_text(file_path, first_page, last_page, file_sha256)
+    except ValueError:
+        raise
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
@@ -41,16 +103,15 @@ def extract_text_from_image(file_path: str) -> str:
         raise Exception("OCR not available - pytesseract not installed")
     
     try:
-        image = Image.open(file_path)
-        text = pytesseract.image_to_string(image)
-        return text.strip()
+        return ocr_file(file_path)
+    except OCRBusy:
+        raise
     except Exception as e:
         raise Exception(f"Error extracting text from image: {str(e)}")
 
 def extract_text_from_txt(file_path: str) -> str:
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read().strip()
+        return read_text_file(file_path)
     except Exception as e:
         raise Exception(f"Error reading text file: {str(e)}")
 
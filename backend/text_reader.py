@@ -0,0 +1,102 @@
+import codecs
+import io
+import mmap
+import os
+from typing import Iterator, Optional
+
+try:
+    # Installed with requests; without it undecodable files fall back to Windows-1252
+    from charset_normalizer import from_bytes
+    CHARSET_DETECTION_AVAILABLE = True
+except ImportError:
+    CHARSET_DETECTION_AVAILABLE = False
+    from_bytes = None
+
+# Bytes decoded per chunk; a chunk of text is at most this many characters
+TEXT_READ_CHUNK_SIZE = int(os.environ.get("TEXT_READ_CHUNK_SIZE", 1 << 20))
+# Leading bytes examined to detect the encoding
+ENCODING_SAMPLE_BYTES = int(os.environ.get("ENCODING_SAMPLE_BYTES", 64 << 10))
+
+# A sample is taken for BOM-less UTF-16 when this share of its bytes are NUL and
+# this share of those fall at the same parity (odd offsets: little-endian)
+UTF16_MIN_NUL_SHARE = 0.1
+UTF16_NUL_PARITY_SHARE = 0.9
+
+# UTF-32 first: its little-endian BOM starts with UTF-16's
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+def detect_encoding(sample: bytes) -> str:
+    """Encoding of a file from its first bytes: byte order mark, UTF-16 NUL pattern, then UTF-8, then statistical detection"""
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if sample.startswith(bom):
+            return encoding
+    # NUL bytes are valid UTF-8, so UTF-16 without a byte order mark must be caught first
+    encoding = _utf16_without_bom(sample)
+    if encoding:
+        return encoding
+    try:
+        # Not final: the sample may end inside a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    if CHARSET_DETECTION_AVAILABLE:
+        matches = from_bytes(sample)
+        best = matches.best()
+        if best is not None:
+            # Mostly-ASCII text often fits several code pages equally well; prefer the Western one
+            for match in matches:
+                if match.encoding == "cp1252" and match.chaos <= best.chaos and match.coherence >= best.coherence:
+                    return "cp1252"
+            return best.encoding
+    return "cp1252"
+
+def _utf16_without_bom(sample: bytes) -> Optional[str]:
+    """utf-16-le or utf-16-be when most NUL bytes fall at odd or at even offsets.
+    
+    Text of mostly Latin characters in UTF-16 has a NUL in almost every other
+    byte, on the high-order side; text in other encodings has few NULs, if any.
+    """
+    even = sample[0::2].count(0)
+    odd = sample[1::2].count(0)
+    nuls = even + odd
+    if nuls < len(sample) * UTF16_MIN_NUL_SHARE:
+        return None
+    if odd >= nuls * UTF16_NUL_PARITY_SHARE:
+        return "utf-16-le"
+    if even >= nuls * UTF16_NUL_PARITY_SHARE:
+        return "utf-16-be"
+    return None
+
+def iter_text_chunks(file_path: str, chunk_size: int = TEXT_READ_CHUNK_SIZE, encoding: Optional[str] = None) -> Iterator[str]:
+    """Decoded text of a file, chunk by chunk, read through a memory map.
+
+    Only one chunk of bytes and its text are in memory at a time, whatever the
+    file size. The encoding is detected from the first ENCODING_SAMPLE_BYTES
+    unless given. Newlines are translated as in text mode, and undecodable
+    bytes become U+FFFD instead of failing the whole file.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            encoding = encoding or detect_encoding(mapped[:ENCODING_SAMPLE_BYTES])
+            decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(errors="replace"), translate=True)
+            for start in range(0, size, chunk_size):
+                text = decoder.decode(mapped[start:start + chunk_size])
+                if text:
+                    yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+
+def read_text_file(file_path: str) -> str:
+    """Whole decoded text of a file, for callers that need it as one string"""
+    return "".join(iter_text_chunks(file_path)).strip()
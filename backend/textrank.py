@@ -0,0 +1,77 @@
+from typing import List
+
+from lazy_imports import load_module, module_available
+
+# NumPy is imported by the first TextRank summary, not at startup
+NUMPY_AVAILABLE = module_available("numpy")
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 100
+TEXTRANK_TOLERANCE = 1e-6
+
+def textrank_scores(sentence_terms: List[List[str]]) -> List[float]:
+    """TextRank centrality of each sentence over the TF-IDF cosine similarity graph.
+
+    Sentences are L2-normalized sparse TF-IDF rows X, so the similarity matrix is
+    S = X X^T without its diagonal. S is never materialized: power iteration only
+    needs products S v = X (X^T v) - v, two sparse matrix-vector products over the
+    (sentence, term) entries. Each iteration is linear in document length instead
+    of quadratic in the number of sentences, and the result is exact.
+    """
+    np = load_module("numpy")
+    n = len(sentence_terms)
+    if n == 0:
+        return []
+    if n == 1:
+        return [1.0]
+
+    rows, terms, weights = _tfidf_rows(sentence_terms)
+    if len(rows) == 0:
+        return [1.0 / n] * n
+
+    # Unit-norm rows have self-similarity 1; sentences without terms have none
+    self_similarity = (np.bincount(rows, minlength=n) > 0).astype(float)
+
+    def similarity_times(vector):
+        term_totals = np.bincount(terms, weights=weights * vector[rows])
+        return np.bincount(rows, weights=weights * term_totals[terms], minlength=n) - self_similarity * vector
+
+    out_weight = similarity_times(np.ones(n))
+    # Rounding can leave tiny non-zero weights on sentences similar to nothing
+    dangling = out_weight <= 1e-12
+    inverse_out = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, out_weight))
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        # S is symmetric, so spreading along normalized out-edges is S (scores / out_weight)
+        spread = similarity_times(scores * inverse_out)
+        # Sentences similar to nothing spread their score evenly, like a random jump
+        updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (spread + scores[dangling].sum() / n)
+        converged = np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores.tolist()
+
+def _tfidf_rows(sentence_terms: List[List[str]]):
+    """L2-normalized TF-IDF entries as (sentence, term id, weight) arrays"""
+    np = load_module("numpy")
+    vocab = {}
+    sizes = [len(terms) for terms in sentence_terms]
+    ids = np.fromiter(
+        (vocab.setdefault(term, len(vocab)) for terms in sentence_terms for term in terms),
+        dtype=np.int64, count=sum(sizes)
+    )
+    rows = np.repeat(np.arange(len(sentence_terms)), sizes)
+    n_terms = max(1, len(vocab))
+
+    keys, counts = np.unique(rows * n_terms + ids, return_counts=True)
+    rows, terms = keys // n_terms, keys % n_terms
+
+    document_frequency = np.bincount(terms, minlength=n_terms)
+    idf = np.log(len(sentence_terms) / document_frequency) + 1.0
+    weights = counts * idf[terms]
+
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(sentence_terms)))
+    weights = weights / norms[rows]
+    return rows, terms, weights
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from fastapi import UploadFile
+
+from executor import run_io
+
+# Uploads are copied to disk this many bytes at a time, so memory use per request is constant
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 1 << 20))
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 100 << 20))
+# Whole request bodies larger than this are refused from the Content-Length header, before parsing
+MAX_UPLOAD_REQUEST_BYTES = int(os.environ.get("MAX_UPLOAD_REQUEST_BYTES", 4 * MAX_UPLOAD_BYTES))
+
+class UploadTooLarge(ValueError):
+    pass
+
+class SpooledUpload:
+    """An upload copied to a private temp directory, with its size and SHA-256.
+
+    The file keeps the upload's base name so extraction can dispatch on the
+    extension. Use as a context manager, or call cleanup(), to delete it.
+    """
+
+    def __init__(self, filename: str, path: str, size: int, sha256: str):
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def cleanup(self):
+        shutil.rmtree(os.path.dirname(self.path), ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+async def spool_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """Copy an upload to disk chunk by chunk, hashing it on the way.
+
+    The size limit is checked against the declared size before any copying and
+    again as bytes arrive, so an oversized upload is dropped as soon as it
+    crosses the limit. Disk writes and hashing run in the I/O pool.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(f"{file.filename} is larger than the {max_bytes:,}-byte upload limit")
+
+    # Only the base name, so a crafted filename cannot escape the temp directory
+    name = os.path.basename(file.filename or "") or "upload"
+    tmp_dir = tempfile.mkdtemp(prefix="upload-")
+    path = os.path.join(tmp_dir, name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"{file.filename} is larger than the {max_bytes:,}-byte upload limit")
+                await run_io(_write_chunk, out, digest, chunk)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return SpooledUpload(name, path, size, digest.hexdigest())
+
+def _write_chunk(out, digest, chunk: bytes):
+    # hashlib releases the GIL for large buffers, so this overlaps with the event loop
+    digest.update(chunk)
+    out.write(chunk)
@@ -1,16 +1,29 @@
-from text_processor import extract_text_from_file, extract_text_from_pdf, extract_text_from_image
-from summarizer import summarize_text, create_extractive_summary, create_bullet_summary, create_executive_summary
-from analyzer import analyze_document, calculate_flesch_score, extract_keywords, analyze_sentiment
+import time
+
+from text_processor import extract_text_from_file, extract_text_from_pdf, extract_text_from_image, get_extraction_cache_stats
+from summarizer import summarize_text, create_extractive_summary, create_bullet_summary, create_executive_summary, create_textrank_summary, get_sentence_ranking, get_summary_cache_stats, stream_summary, shared_ranking, anytime_ranking, run_summary_task, submit_summary_task, stream_ranking
+from ocr import OCRBusy, get_ocr_stats, shutdown_ocr_pool
+from pdf_extraction import get_pdf_cache_stats
+from executor import Overloaded, run_cpu, run_io, call_async, warm_cpu_pool, set_worker_setup, get_executor_stats, CPU_WORKERS, shutdown_executors
+from lazy_imports import load_module, module_available, record_startup, get_import_report
+from text_reader import iter_text_chunks, read_text_file
+from inference import get_inference_client, close_inference_client
+from analyzer import analyze_document, analyze_documents, analyze_stream, analyze_text_file, calculate_flesch_score, extract_keywords, analyze_sentiment, get_analysis_cache_stats, STREAM_CHUNK_SIZE
+from word_features import preload_lexicon, preload_configured_lexicon, prepare_process, get_word_feature_stats, WORD_LEXICON_PATH
+from lexicon import get_lexicon
 from exporters import export_to_pdf, export_to_docx, export_to_markdown, export_to_txt
 from database import save_document, get_document, get_all_documents, search_documents, delete_document
 
+# Extractor and exporter libraries that are otherwise imported on first use
+WARM_UP_MODULES = ("PIL.Image", "PyPDF2", "pytesseract", "reportlab.platypus", "docx")
+
 async def create_qa_summary(text, length="medium"):
     base_summary = await summarize_text(text, length)
     
     if not base_summary or "No meaningful content" in base_summary:
         return "Q&A SUMMARY\n\nQ: What is in this document?\nA: No readable content found."
     
-    word_count = len(text.split())
+    word_count = get_sentence_ranking(text).word_count
     
     # Simple Q&A format
     qa_parts = []
@@ -36,7 +49,7 @@ async def create_topic_summary(text, length="medium"):
     if not base_summary or "No meaningful content" in base_summary:
         return "TOPIC SUMMARY\n\nNo identifiable topics found in the document."
     
-    word_count = len(text.split())
+    word_count = get_sentence_ranking(text).word_count
     
     # Simple topic format
     topic_parts = []
@@ -51,3 +64,68 @@ async def create_topic_summary(text, length="medium"):
     topic_parts.append(f"• Scope: {'Detailed coverage' if word_count > 500 else 'Focused discussion'}")
     
     return "\n".join(topic_parts)
+
+async def create_summary(text, summary_type="standard", length="medium"):
+    if summary_type == "bullet_points":
+        return await create_bullet_summary(text, length)
+    elif summary_type == "executive":
+        return await create_executive_summary(text, length)
+    elif summary_type == "qa":
+        return await create_qa_summary(text, length)
+    elif summary_type == "topics":
+        return await create_topic_summary(text, length)
+    elif summary_type == "textrank":
+        return await create_textrank_summary(text, length)
+    elif summary_type == "detailed":
+        # For detailed summary, use longer length and more comprehensive format
+        return await summarize_text(text, "long")
+    else:
+        return await summarize_text(text, length)
+
+async def summarize_within_budget(text, summary_type, length, deadline):
+    """(summary, complete) built from the ranking that fits before deadline, a time.time() value"""
+    ranking, complete = anytime_ranking(text, deadline)
+    with shared_ranking(text, ranking):
+        summary = await create_summary(text, summary_type, length)
+    return summary, complete
+
+async def create_summary_with_word_count(text, summary_type="standard", length="medium"):
+    """(summary, document word count) from one ranking, for callers outside the worker that built it"""
+    with shared_ranking(text):
+        summary = await create_summary(text, summary_type, length)
+        return summary, get_sentence_ranking(text).word_count
+
+async def create_summary_bundle(text, specs):
+    """(results, word count) for (summary_type, length) specs, all selected from one scoring pass"""
+    results = []
+    built = {}
+    with shared_ranking(text):
+        word_count = get_sentence_ranking(text).word_count
+        for summary_type, length in specs:
+            try:
+                if (summary_type, length) not in built:
+                    built[summary_type, length] = await create_summary(text, summary_type, length)
+                results.append({"summary_type": summary_type, "length": length, "success": True, "summary": built[summary_type, length]})
+            except Exception as e:
+                results.append({"summary_type": summary_type, "length": length, "success": False, "error": str(e)})
+    return results, word_count
+
+async def summarize_text_file(file_path, summary_type="standard", length="medium"):
+    """Summary of a text file ranked chunk by chunk, never holding the whole text in memory"""
+    # The builders take the ranking in place of the text, see get_sentence_ranking
+    ranking = stream_ranking(iter_text_chunks(file_path))
+    return await create_summary(ranking, summary_type, length)
+
+def preload_modules():
+    """Import the lazily loaded libraries and compile the lexicon now"""
+    for name in WARM_UP_MODULES:
+        if module_available(name.split(".")[0]):
+            load_module(name)
+    get_lexicon()
+
+def warm_up():
+    """Pay the deferred cold-start costs before the first request, in this process and every CPU worker"""
+    started = time.perf_counter()
+    preload_modules()
+    warm_cpu_pool(preload_modules)
+    record_startup("warm_up", started)
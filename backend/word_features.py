@@ -0,0 +1,82 @@
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple
+
+from lexicon import get_lexicon
+
+WORD_FEATURE_CACHE_SIZE = int(os.environ.get("WORD_FEATURE_CACHE_SIZE", 200000))
+# Optional word list, one word per line, preloaded into every process that scores text
+WORD_LEXICON_PATH = os.environ.get("WORD_LEXICON_PATH")
+
+class WordFeatures(NamedTuple):
+    lower: str
+    length: int
+    syllables: int
+    is_alpha: bool
+    is_upper: bool
+    is_stopword: bool
+
+def count_syllables(word: str) -> int:
+    word = word.lower()
+    vowels = 'aeiouy'
+    count = 0
+    prev_char_was_vowel = False
+
+    for char in word:
+        is_vowel = char in vowels
+        if is_vowel and not prev_char_was_vowel:
+            count += 1
+        prev_char_was_vowel = is_vowel
+
+    if word.endswith('e'):
+        count -= 1
+
+    return max(1, count)
+
+@lru_cache(maxsize=WORD_FEATURE_CACHE_SIZE)
+def get_word_features(word: str) -> WordFeatures:
+    """Features of one distinct token, memoized across documents and requests"""
+    lower = word.lower()
+    return WordFeatures(
+        lower=lower,
+        length=len(word),
+        syllables=count_syllables(word),
+        is_alpha=word.isalpha(),
+        is_upper=word.isupper(),
+        is_stopword=lower in get_lexicon().keyword_stop_words
+    )
+
+def preload_words(words: Iterable[str]) -> int:
+    """Warm the feature cache with known vocabulary; returns the number of words loaded"""
+    loaded = 0
+    for word in words:
+        word = word.strip()
+        if word:
+            get_word_features(word)
+            loaded += 1
+    return loaded
+
+def preload_lexicon(file_path: str) -> int:
+    """Warm the feature cache from a word list file with one word per line"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return preload_words(f)
+
+def preload_configured_lexicon() -> int:
+    """Warm this process's feature cache from WORD_LEXICON_PATH, if set"""
+    return preload_lexicon(WORD_LEXICON_PATH) if WORD_LEXICON_PATH else 0
+
+def prepare_process():
+    """Compile the lexicon and warm the feature cache; run as each CPU worker starts"""
+    get_lexicon()
+    preload_configured_lexicon()
+
+def get_word_feature_stats() -> Dict:
+    info = get_word_features.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 3) if lookups else 0.0
+    }